@@ -5,6 +5,8 @@ control the pipette's velocities along x, y, and z axes, and it aims to reach a
 randomly generated goal position within a bounding box.
 """
 
+import math
+import time
 import gymnasium as gym
 from gymnasium import spaces
 import numpy as np
@@ -18,6 +20,7 @@ class OT2Env(gym.Env):
     Attributes:
         render (bool): Flag to enable/disable rendering within the simulation.
         max_steps (int): Maximum number of steps before truncation.
+        render_fps (float): Optional step rate limit, only applied while rendering.
         sim (Simulation): The underlying Simulation instance used for environment steps.
         action_space (gym.Space): Defines the valid range of actions for the agent.
         observation_space (gym.Space): Defines the shape/range of valid observations.
@@ -25,7 +28,7 @@ class OT2Env(gym.Env):
         goal_position (np.ndarray): The 3D coordinates of the target position.
     """
 
-    def __init__(self, render=False, max_steps=1000):
+    def __init__(self, render=False, max_steps=1000, render_fps=None):
         """
         Initializes the environment by creating a Simulation instance and defining
         the action and observation spaces.
@@ -33,10 +36,18 @@ class OT2Env(gym.Env):
         Args:
             render (bool, optional): Whether to enable the simulation's visualization.
             max_steps (int, optional): The maximum number of steps allowed per episode.
+            render_fps (float, optional): When rendering, limit step() to this many steps
+                                          per second so the motion can be watched.
+                                          Headless runs are never throttled.
         """
         super(OT2Env, self).__init__()
         self.render = render
         self.max_steps = max_steps
+        self.render_fps = render_fps
+
+        # Minimum wall-clock time per step (0 = unthrottled) and when the last step ended
+        self._frame_time = 1.0 / render_fps if render and render_fps else 0.0
+        self._last_step_end = 0.0
         
         # Create the Simulation instance: 1 agent, optionally rendered
         self.sim = Simulation(num_agents=1, render=render)
@@ -44,6 +55,9 @@ class OT2Env(gym.Env):
         # Action space: control velocities for x, y, z axes in [-1.0, 1.0]
         # The final dimension (4th) for the simulation is reserved for no liquid dispensing (0).
         self.action_space = spaces.Box(low=-1.0, high=1.0, shape=(3,), dtype=np.float32)
+        # Bounds of the action space, looked up once for the clip in step()
+        self._action_low = self.action_space.low
+        self._action_high = self.action_space.high
         
         # Observation space: 
         # [pipette_x, pipette_y, pipette_z, goal_x, goal_y, goal_z]
@@ -56,19 +70,66 @@ class OT2Env(gym.Env):
         )
         
         self.steps = 0
-        self.goal_position = None
+
+        # Bounds for sampling random goals: [-0.5, 0.5] for x and y, [0.0, 0.5] for z
+        self._goal_low = np.array([-0.5, -0.5, 0.0], dtype=np.float32)
+        self._goal_high = np.array([0.5, 0.5, 0.5], dtype=np.float32)
+
+        # Preallocated float32 buffers for the goal and the observation, reused every step
+        self._goal = np.empty(3, dtype=np.float32)
+        self._obs = np.empty(6, dtype=np.float32)
+
+        # The float32 goal as plain Python floats, for the scalar distance math in step()
+        self._goal_xyz = (0.0, 0.0, 0.0)
+
+        # Action sent to the Simulation: [vx, vy, vz, dispense]; dispense stays 0.
+        # The wrapping list is kept too so step() doesn't build a new one every call.
+        self._sim_action = np.zeros(4, dtype=np.float32)
+        self._sim_action_wrap = [self._sim_action]
+
+        # Robot ID key of the Simulation state, looked up once per reset()
+        self._robot_id_key = None
+
+        # True once set_target() pinned the goal; reset() then keeps it
+        self._target_fixed = False
+
+    @property
+    def goal_position(self):
+        """np.ndarray: The 3D coordinates of the current goal position."""
+        return self._goal
+
+    def set_target(self, xyz):
+        """
+        Pins the goal to a fixed position. The position is written into the existing
+        goal buffer (no new array), the observation is updated right away, and later
+        resets keep this goal instead of sampling a random one.
+
+        Args:
+            xyz (sequence of float): The goal position [x, y, z], or None to go back
+                                     to a random goal on every reset.
+        """
+        if xyz is None:
+            self._target_fixed = False
+            return
+        self._goal[:] = xyz
+        self._obs[3:] = self._goal
+        self._goal_xyz = tuple(self._goal.tolist())
+        self._target_fixed = True
 
     def reset(self, seed=None, options=None):
         """
         Resets the environment at the start of each episode:
-          1) Resamples a random goal position within [-0.5, 0.5] for x and y, and [0.0, 0.5] for z.
+          1) Resamples a random goal position within [-0.5, 0.5] for x and y, and [0.0, 0.5] for z,
+             unless a fixed goal is passed via options={"goal": [x, y, z]} or was pinned
+             with set_target().
           2) Resets the Simulation.
           3) Returns the initial observation array:
              [pipette_x, pipette_y, pipette_z, goal_x, goal_y, goal_z]
 
         Args:
             seed (int, optional): Seed for the environment's random number generator.
-            options (dict, optional): Additional reset options (unused here).
+            options (dict, optional): Additional reset options. If it contains "goal",
+                                      that position is used instead of a random one.
 
         Returns:
             observation (np.ndarray): The initial state (pipette pos + goal pos).
@@ -76,25 +137,34 @@ class OT2Env(gym.Env):
         """
         super().reset(seed=seed)
         
-        # Sample a random goal within specified bounds
-        self.goal_position = np.random.uniform(
-            low=[-0.5, -0.5, 0.0],
-            high=[0.5, 0.5, 0.5]
-        )
+        if options and "goal" in options:
+            # Use the requested goal, so the returned observation already contains it
+            self._goal[:] = options["goal"]
+        elif self._target_fixed:
+            # Keep the goal pinned by set_target()
+            pass
+        else:
+            # Sample a random goal within specified bounds using the env's own RNG
+            # (seeded by super().reset), so every env in a VecEnv gets its own stream
+            self._goal[:] = self.np_random.uniform(self._goal_low, self._goal_high)
 
         # Reset the simulation environment
         state = self.sim.reset(num_agents=1)
         
-        # Dynamically fetch the robot ID key from the returned state dictionary
-        robot_id_key = list(state.keys())[0]
-        pipette_position = state[robot_id_key]["pipette_position"]
+        # Dynamically fetch the robot ID key from the returned state dictionary.
+        # It stays the same for the whole episode, so step() reuses the cached key.
+        self._robot_id_key = next(iter(state))
+        pipette_position = state[self._robot_id_key]["pipette_position"]
 
-        # Create the observation array by concatenating pipette position + goal position
-        observation = np.array(pipette_position + list(self.goal_position), dtype=np.float32)
+        # Write pipette position + goal position into the observation buffer.
+        # The goal part stays untouched until the next reset.
+        self._obs[:3] = pipette_position
+        self._obs[3:] = self._goal
+        self._goal_xyz = tuple(self._goal.tolist())
         
         # Reset step count
         self.steps = 0
-        return observation, {}
+        return self._obs.copy(), {}
 
     def step(self, action):
         """
@@ -114,24 +184,30 @@ class OT2Env(gym.Env):
             truncated (bool): True if the maximum number of steps has been reached.
             info (dict): Additional information about the episode (e.g., final reward).
         """
-        # Ensure action is within the allowed range
-        action = np.clip(action, -1.0, 1.0)
-        
-        # Append the 4th dimension as 0 (no dispensing), as required by Simulation
-        scaled_action = list(action) + [0]
+        # Clip the action straight into the simulation action buffer; the 4th
+        # dimension stays 0 (no dispensing), as required by Simulation
+        np.clip(action, self._action_low, self._action_high, out=self._sim_action[:3])
         
         # Run the simulation with the provided actions
-        state = self.sim.run([scaled_action])
+        state = self.sim.run(self._sim_action_wrap)
         
         # Retrieve the pipette's position from the simulation state
-        robot_id_key = list(state.keys())[0]
-        pipette_position = state[robot_id_key]["pipette_position"]
-        
-        # Create the new observation array
-        observation = np.array(pipette_position + list(self.goal_position), dtype=np.float32)
-
-        # Calculate the distance to the goal and use it for reward (negative distance)
-        distance = np.linalg.norm(np.array(pipette_position) - np.array(self.goal_position))
+        pipette_position = state[self._robot_id_key]["pipette_position"]
+        
+        # Write the new pipette position into the preallocated float32 buffer
+        # (the goal part was already written on reset)
+        self._obs[:3] = pipette_position
+        observation = self._obs.copy()
+
+        # Calculate the distance to the goal and use it for reward (negative distance).
+        # Both positions are the float32 values the policy observes; plain scalar math
+        # is cheaper than NumPy dispatch for just 3 elements.
+        px, py, pz = observation[:3].tolist()
+        gx, gy, gz = self._goal_xyz
+        dx = px - gx
+        dy = py - gy
+        dz = pz - gz
+        distance = math.sqrt(dx * dx + dy * dy + dz * dz)
         reward = -distance
         
         # Check termination condition: reached the goal if distance < 0.01
@@ -147,6 +223,13 @@ class OT2Env(gym.Env):
         
         # Increment step counter
         self.steps += 1
+
+        # Pace the rendered simulation to render_fps (skipped when headless)
+        if self._frame_time:
+            remaining = self._frame_time - (time.perf_counter() - self._last_step_end)
+            if remaining > 0:
+                time.sleep(remaining)
+            self._last_step_end = time.perf_counter()
         
         # Return the standard Gym tuple
         return observation, reward, terminated, truncated, info
@@ -3,10 +3,17 @@ from wandb.integration.sb3 import WandbCallback
 from stable_baselines3 import PPO
 import gymnasium as gym
 import os
+import time
 import argparse
+import multiprocessing as mp
 from ot2_gym_wrapper import OT2Env
 from stable_baselines3.common.callbacks import BaseCallback
+from stable_baselines3.common.env_util import make_vec_env
+from stable_baselines3.common.vec_env import DummyVecEnv, VecMonitor
+from shared_vec_env import SharedMemSubprocVecEnv
 import numpy as np
+import torch
+from concurrent.futures import ThreadPoolExecutor
 from typing_extensions import TypeIs
 import tensorflow
 from wandb.sdk import Artifact
@@ -16,75 +23,75 @@ import shutil
 # Set the API key for wandb
 os.environ['WANDB_API_KEY'] = "76bf2b8cae2c414adb5c3b1292a61d5b3200b733"
 
-# Initialize wandb project
-run = wandb.init(project="Task 11", sync_tensorboard=True)
-
-# Wrap the base environment with your custom wrapper
-env = OT2Env()
-
-# Argument parser setup
-parser = argparse.ArgumentParser()
-parser.add_argument("--learning_rate", type=float, default=0.0001, help="Learning rate for the PPO model")
-parser.add_argument("--batch_size", type=int, default=32, help="Batch size for the PPO model")
-parser.add_argument("--n_steps", type=int, default=2048, help="Number of steps per PPO update")
-parser.add_argument("--n_epochs", type=int, default=10, help="Number of epochs for PPO optimization")
-parser.add_argument("--gamma", type=float, default=0.98, help="Discount factor for future rewards")
-parser.add_argument("--value_coefficient", type=float, default=0.5, help="Value function loss coefficient")
-parser.add_argument("--clip_range", type=float, default=0.2, help="Clipping range for PPO updates")
-parser.add_argument("--policy", type=str, default="MlpPolicy", help="Policy architecture to use in PPO")
-args, unknown = parser.parse_known_args()
-
-# Initialize the PPO model with updated hyperparameters
-model = PPO(
-    policy=args.policy,
-    env=env,
-    verbose=1,
-    learning_rate=args.learning_rate,
-    batch_size=args.batch_size,
-    n_steps=args.n_steps,
-    n_epochs=args.n_epochs,
-    gamma=args.gamma,
-    vf_coef=args.value_coefficient,
-    clip_range=args.clip_range,
-    tensorboard_log=f"runs/{run.id}",
-)
-
-# Create directories for saving models
-model_dir = f"models/{run.id}"
-os.makedirs(model_dir, exist_ok=True)
-
-# Create wandb callback
-wandb_callback = WandbCallback(
-    model_save_freq=100000,  # Save every 100,000 steps
-    model_save_path=model_dir,
-    verbose=2
-)
-
 # Custom callback to save the best model
 class SaveBestModelCallback(BaseCallback):
-    def __init__(self, verbose=0):
+    def __init__(self, model_dir, verbose=0):
         super(SaveBestModelCallback, self).__init__(verbose)
         self.best_mean_reward = -np.inf
         self.best_model_path = os.path.join(model_dir, "best_model")
+        # New best policies are written by a background thread so training doesn't wait on disk
+        self.best_policy_path = os.path.join(model_dir, "best_policy.pt")
+        self._save_executor = ThreadPoolExecutor(max_workers=1)
+        self._pending_save = None
+        # Episode rewards are buffered and sent to wandb in batches rather than one call per episode
+        self._pending_rewards = []
+        self._last_flush = time.perf_counter()
+
+    def _flush_rewards(self):
+        if self._pending_rewards:
+            wandb.log({
+                "mean_reward": float(np.mean(self._pending_rewards)),
+                "best_mean_reward": self.best_mean_reward,
+            }, step=self.num_timesteps)
+            self._pending_rewards.clear()
+        self._last_flush = time.perf_counter()
+
+    def _save_best_policy_async(self):
+        # Snapshot the weights on the CPU first, the live tensors keep changing while training
+        state_dict = {k: v.detach().cpu().clone() for k, v in self.model.policy.state_dict().items()}
+        # Only the newest best matters, so drop an older save that hasn't started yet
+        if self._pending_save is not None:
+            self._pending_save.cancel()
+        self._pending_save = self._save_executor.submit(torch.save, state_dict, self.best_policy_path)
 
     def _on_step(self) -> bool:
-        if "infos" in self.locals and "episode" in self.locals["infos"][0]:
-            episode_info = self.locals["infos"][0]["episode"]
-            if "r" in episode_info:
-                reward = episode_info["r"]  # Use the single reward value
-                wandb.log({"mean_reward": reward}, step=self.num_timesteps)
-
-                # Save the best model
-                if reward > self.best_mean_reward:
-                    self.best_mean_reward = reward
-                    print(f"New best reward: {reward}. Saving model...")
-                    self.model.save(self.best_model_path)
-                    wandb.log({"best_mean_reward": reward}, step=self.num_timesteps)
+        # With a vectorized env every worker reports its own info dict
+        for info in self.locals.get("infos", []):
+            episode_info = info.get("episode")
+            if episode_info is None or "r" not in episode_info:
+                continue
+            reward = episode_info["r"]
+            self._pending_rewards.append(reward)
+
+            # Save the best model
+            if reward > self.best_mean_reward:
+                self.best_mean_reward = reward
+                print(f"New best reward: {reward}. Saving model...")
+                self._save_best_policy_async()
+
+        # Send the buffered rewards every 64 episodes or once a second
+        if len(self._pending_rewards) >= 64 or time.perf_counter() - self._last_flush > 1.0:
+            self._flush_rewards()
         return True
 
 
 
+    def _write_best_model_zip(self):
+        # Wait for the last background save, then package the best weights as a regular
+        # SB3 zip (loadable with PPO.load) and put the current weights back afterwards
+        if self._pending_save is not None:
+            self._pending_save.result()
+        self._save_executor.shutdown(wait=True)
+        if not os.path.exists(self.best_policy_path):
+            return
+        current_state = {k: v.detach().clone() for k, v in self.model.policy.state_dict().items()}
+        self.model.policy.load_state_dict(torch.load(self.best_policy_path, map_location=self.model.device))
+        self.model.save(self.best_model_path)
+        self.model.policy.load_state_dict(current_state)
+
     def _on_training_end(self) -> None:
+        self._flush_rewards()
+        self._write_best_model_zip()
         if os.path.exists(f"{self.best_model_path}.zip"):
             print(f"Uploading the best model with mean reward: {self.best_mean_reward}")
             artifact = Artifact(name="best_model", type="model")
@@ -95,28 +102,100 @@ class SaveBestModelCallback(BaseCallback):
             print(f"No best model found to upload. Best reward: {self.best_mean_reward}.")
 
 
-save_best_callback = SaveBestModelCallback()
-
-# Total training timesteps
-total_timesteps = 5000000
-
-# Train the model for 5 million steps
-print("Starting training for 5 million steps...")
-model.learn(
-    total_timesteps=total_timesteps,
-    callback=[wandb_callback, save_best_callback],
-    progress_bar=True,
-    reset_num_timesteps=False,
-    tb_log_name=f"runs/{run.id}"
-)
-print("Training completed.")
-
-# Save the final model
-final_model_path = f"{model_dir}/final_model"
-model.save(final_model_path)
-print(f"Final model saved at: {final_model_path}")
-
-# Save the best model to WandB
-print("Uploading the best model to WandB...")
-wandb.save(f"{save_best_callback.best_model_path}.zip")
-print("Best model uploaded to WandB.")
\ No newline at end of file
+def main():
+    """
+    Parses the hyperparameters, sets up wandb and the vectorized OT2Env, and trains PPO.
+
+    Everything runs in here rather than at module level, because the SubprocVecEnv
+    workers import this module again; without the __main__ guard below every worker
+    would start a training run (and a wandb run) of its own.
+    """
+    # Argument parser setup
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--learning_rate", type=float, default=0.0001, help="Learning rate for the PPO model")
+    parser.add_argument("--batch_size", type=int, default=32, help="Batch size for the PPO model")
+    parser.add_argument("--n_steps", type=int, default=2048, help="Number of steps per PPO update")
+    parser.add_argument("--n_epochs", type=int, default=10, help="Number of epochs for PPO optimization")
+    parser.add_argument("--gamma", type=float, default=0.98, help="Discount factor for future rewards")
+    parser.add_argument("--value_coefficient", type=float, default=0.5, help="Value function loss coefficient")
+    parser.add_argument("--clip_range", type=float, default=0.2, help="Clipping range for PPO updates")
+    parser.add_argument("--policy", type=str, default="MlpPolicy", help="Policy architecture to use in PPO")
+    parser.add_argument("--num_envs", type=int, default=8, help="Number of parallel environments for rollout collection")
+    parser.add_argument("--vec_mode", type=str, default="async", choices=["sync", "async"],
+                        help="'async' steps envs in subprocesses (SharedMemSubprocVecEnv), 'sync' steps them in-process (DummyVecEnv)")
+    parser.add_argument("--offline", action="store_true", help="Log to wandb offline (sync later with `wandb sync`)")
+    args, unknown = parser.parse_known_args()
+
+    # Initialize wandb project
+    run = wandb.init(project="Task 11", sync_tensorboard=True, mode="offline" if args.offline else "online")
+
+    # Run num_envs headless OT2Env instances, either one per worker process (async) or
+    # sequentially in this process (sync), which avoids IPC overhead for lightweight envs.
+    # The async workers hand their observations over through shared memory.
+    # VecMonitor aggregates episode rewards across workers for the callbacks below.
+    vec_env_cls = SharedMemSubprocVecEnv if args.vec_mode == "async" else DummyVecEnv
+    env = make_vec_env(lambda: OT2Env(render=False), n_envs=args.num_envs, vec_env_cls=vec_env_cls)
+    env = VecMonitor(env)
+
+    # n_steps is per environment, so scale it down to keep the total rollout size per update
+    n_steps_per_env = max(args.n_steps // args.num_envs, 1)
+
+    # Initialize the PPO model with updated hyperparameters
+    model = PPO(
+        policy=args.policy,
+        env=env,
+        verbose=1,
+        learning_rate=args.learning_rate,
+        batch_size=args.batch_size,
+        n_steps=n_steps_per_env,
+        n_epochs=args.n_epochs,
+        gamma=args.gamma,
+        vf_coef=args.value_coefficient,
+        clip_range=args.clip_range,
+        tensorboard_log=f"runs/{run.id}",
+    )
+
+    # Create directories for saving models
+    model_dir = f"models/{run.id}"
+    os.makedirs(model_dir, exist_ok=True)
+
+    # Create wandb callback
+    wandb_callback = WandbCallback(
+        model_save_freq=100000,  # Save every 100,000 steps
+        model_save_path=model_dir,
+        verbose=2
+    )
+
+    save_best_callback = SaveBestModelCallback(model_dir)
+
+    # Total training timesteps
+    total_timesteps = 5000000
+
+    # Train the model for 5 million steps
+    print("Starting training for 5 million steps...")
+    model.learn(
+        total_timesteps=total_timesteps,
+        callback=[wandb_callback, save_best_callback],
+        progress_bar=True,
+        reset_num_timesteps=False,
+        tb_log_name=f"runs/{run.id}"
+    )
+    print("Training completed.")
+
+    # Save the final model
+    final_model_path = f"{model_dir}/final_model"
+    model.save(final_model_path)
+    print(f"Final model saved at: {final_model_path}")
+
+    # Shut down the env workers (and release the shared observation buffer)
+    env.close()
+
+    # Save the best model to WandB
+    print("Uploading the best model to WandB...")
+    wandb.save(f"{save_best_callback.best_model_path}.zip")
+    print("Best model uploaded to WandB.")
+
+
+if __name__ == "__main__":
+    mp.set_start_method("spawn", force=True)
+    main()
@@ -0,0 +1,125 @@
+"""
+This module defines SharedMemSubprocVecEnv, a SubprocVecEnv that passes observations
+from the worker processes to the learner through shared memory instead of pickling
+them through the pipes on every step.
+
+The parent process allocates one (n_envs, *obs_shape) buffer. Every worker wraps its
+environment in SharedObsWrapper, which writes each observation into that worker's row
+of the buffer. The pipes then only carry rewards, dones and infos; the observation is
+only sent along at the end of an episode, where SB3 needs it as "terminal_observation".
+"""
+
+from functools import partial
+from multiprocessing import shared_memory
+
+import gymnasium as gym
+import numpy as np
+from stable_baselines3.common.vec_env import SubprocVecEnv
+
+
+class SharedObsWrapper(gym.Wrapper):
+    """
+    Gym wrapper (used inside a worker process) that writes every observation into a
+    row of a shared memory buffer and returns None in its place.
+
+    Attributes:
+        shm (SharedMemory): Handle to the shared buffer, kept open for the wrapper's lifetime.
+        obs_view (np.ndarray): View of this environment's row in the shared buffer.
+    """
+
+    def __init__(self, env, shm_name, index, obs_shape, obs_dtype):
+        """
+        Attaches to the shared buffer created by the parent process.
+
+        Args:
+            env (gym.Env): The environment to wrap.
+            shm_name (str): Name of the shared memory block.
+            index (int): Row of the buffer owned by this environment.
+            obs_shape (tuple): Shape of a single observation.
+            obs_dtype (np.dtype): Dtype of the observations.
+        """
+        super().__init__(env)
+        self.shm = shared_memory.SharedMemory(name=shm_name)
+        buffer = np.ndarray((index + 1, *obs_shape), dtype=obs_dtype, buffer=self.shm.buf)
+        self.obs_view = buffer[index]
+
+    def reset(self, **kwargs):
+        observation, info = self.env.reset(**kwargs)
+        self.obs_view[:] = observation
+        return None, info
+
+    def step(self, action):
+        observation, reward, terminated, truncated, info = self.env.step(action)
+        self.obs_view[:] = observation
+        # The final observation of an episode still goes through the pipe, since the
+        # worker resets right away and the reset observation overwrites the buffer
+        returned_obs = observation if terminated or truncated else None
+        return returned_obs, reward, terminated, truncated, info
+
+    def close(self):
+        super().close()
+        self.shm.close()
+
+
+def _make_shared_env(env_fn, shm_name, index, obs_shape, obs_dtype):
+    """Builds the environment in the worker and wraps it with SharedObsWrapper."""
+    return SharedObsWrapper(env_fn(), shm_name, index, obs_shape, obs_dtype)
+
+
+class SharedMemSubprocVecEnv(SubprocVecEnv):
+    """
+    SubprocVecEnv that reads observations from a shared memory buffer.
+
+    Attributes:
+        shm (SharedMemory): The shared observation buffer, owned by this process.
+        obs_buffer (np.ndarray): (n_envs, *obs_shape) view of the shared buffer.
+    """
+
+    def __init__(self, env_fns, start_method=None, obs_shape=(6,), obs_dtype=np.float32):
+        """
+        Allocates the shared observation buffer and starts the worker processes.
+
+        Args:
+            env_fns (list): Functions that each create one environment.
+            start_method (str, optional): Multiprocessing start method, see SubprocVecEnv.
+            obs_shape (tuple, optional): Shape of a single observation. Defaults to the
+                                         (6,) observation of OT2Env.
+            obs_dtype (np.dtype, optional): Dtype of the observations. Defaults to float32.
+        """
+        n_envs = len(env_fns)
+        obs_dtype = np.dtype(obs_dtype)
+        size = n_envs * int(np.prod(obs_shape)) * obs_dtype.itemsize
+        self.shm = shared_memory.SharedMemory(create=True, size=size)
+        self.obs_buffer = np.ndarray((n_envs, *obs_shape), dtype=obs_dtype, buffer=self.shm.buf)
+
+        shared_env_fns = [
+            partial(_make_shared_env, env_fn, self.shm.name, index, tuple(obs_shape), obs_dtype)
+            for index, env_fn in enumerate(env_fns)
+        ]
+        try:
+            super().__init__(shared_env_fns, start_method=start_method)
+        except Exception:
+            # Don't leak the shared block if the workers fail to start
+            self.shm.close()
+            self.shm.unlink()
+            raise
+
+    def step_wait(self):
+        results = [remote.recv() for remote in self.remotes]
+        self.waiting = False
+        _, rewards, dones, infos, self.reset_infos = zip(*results)
+        # Copy, since the workers overwrite the buffer on the next step while
+        # the learner still holds on to these observations
+        return self.obs_buffer.copy(), np.stack(rewards), np.stack(dones), infos
+
+    def reset(self):
+        # The workers return None for the observation; the real ones are in the buffer
+        super().reset()
+        return self.obs_buffer.copy()
+
+    def close(self):
+        if self.closed:
+            return
+        super().close()
+        self.shm.close()
+        self.shm.unlink()
@@ -2,7 +2,7 @@
 This script demonstrates how to:
 1) Load a pre-trained PPO model from a saved file.
 2) Initialize an OT2Env environment with custom display and maximum cycles.
-3) Override the environment's target position with a randomly generated goal.
+3) Reset the environment with a randomly generated goal.
 4) Roll out a policy in the environment, logging reward and distance information.
 5) Terminate when the goal is reached or the environment signals done.
 6) Optionally, examine the actions taken in the process.
@@ -11,8 +11,12 @@ Usage:
     - Make sure you have stable-baselines3 installed for PPO.
     - Update the model_path to the location of your trained PPO model.
     - Run this script to see the agent attempt to reach a randomly generated goal.
+    - Pass --realtime to slow the rollout down to ~10 steps per second for watching,
+      and --verbose to log the details of every step.
 """
 
+import argparse
+import logging
 import numpy as np
 from stable_baselines3 import PPO
 from ot2_gym_wrapper import OT2Env  # Custom environment module
@@ -46,80 +50,102 @@ def generate_random_goal(bounds):
         np.random.uniform(bounds["z"][0], bounds["z"][1]),
     ])
 
-# ------------------------------------------------------------------------------
-# Path to the trained model
-# ------------------------------------------------------------------------------
-# Update this path to point to the correct location of your trained PPO model.
-model_path = r"C:\Users\Michon\Documents\GitHub\2024-25b-fai2-adsai-MichonGoddijn231849\datalab_tasks\task11\models\dkj26bvp\best_model.zip"
-
-# ------------------------------------------------------------------------------
-# Load the trained model
-# ------------------------------------------------------------------------------
-model = PPO.load(model_path)
-
-# ------------------------------------------------------------------------------
-# Initialize the environment
-# ------------------------------------------------------------------------------
-# OT2Env is a custom environment from the 'ot2_gym_wrapper' module. We set:
-#    display=True for any available visual rendering.
-#    max_cycles=2000 as the maximum number of steps per episode.
-#    idle_limit=100 to define how many idle steps are allowed (if used in the environment).
-env = OT2Env(display=True, max_cycles=2000, idle_limit=100)
-
-# ------------------------------------------------------------------------------
-# Reset the environment and generate a random goal
-# ------------------------------------------------------------------------------
-obs, _ = env.reset()
-random_goal = generate_random_goal(position_bounds)
-env.target_position = random_goal  # Override the default target in the environment
-print(f"Randomly Generated Goal: {random_goal}")
-
-# ------------------------------------------------------------------------------
-# Tracking variables for analysis
-# ------------------------------------------------------------------------------
-reward_history = []
-distance_history = []
-action_history = []
-total_reward = 0
-
-# ------------------------------------------------------------------------------
-# Run the model for up to 2000 steps (or until goal is reached)
-# ------------------------------------------------------------------------------
-for step in range(2000):
-    # Add a short delay to slow down the simulation and observe it
-    time.sleep(0.1)  # 100ms delay per step
-
-    # Use the loaded PPO model to predict the next action in a deterministic manner
-    action, _ = model.predict(obs, deterministic=True)
+def main():
+    """
+    Loads the trained PPO model and rolls it out towards a random goal.
+    """
+    # ------------------------------------------------------------------------------
+    # Command line options
+    # ------------------------------------------------------------------------------
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--realtime", action="store_true", help="Sleep 100ms per step so the rollout can be watched")
+    parser.add_argument("--verbose", action="store_true", help="Log the action, reward and distance of every step")
+    args, unknown = parser.parse_known_args()
+
+    # Episode-level messages are logged at INFO, per-step details at DEBUG (--verbose)
+    logging.basicConfig(format="%(message)s")
+    logger = logging.getLogger(__name__)
+    logger.setLevel(logging.DEBUG if args.verbose else logging.INFO)
+
+    # ------------------------------------------------------------------------------
+    # Path to the trained model
+    # ------------------------------------------------------------------------------
+    # Update this path to point to the correct location of your trained PPO model.
+    model_path = r"C:\Users\Michon\Documents\GitHub\2024-25b-fai2-adsai-MichonGoddijn231849\datalab_tasks\task11\models\dkj26bvp\best_model.zip"
+
+    # ------------------------------------------------------------------------------
+    # Load the trained model
+    # ------------------------------------------------------------------------------
+    model = PPO.load(model_path)
+
+    # ------------------------------------------------------------------------------
+    # Initialize the environment
+    # ------------------------------------------------------------------------------
+    # OT2Env is a custom environment from the 'ot2_gym_wrapper' module. We set:
+    #    display=True for any available visual rendering.
+    #    max_cycles=2000 as the maximum number of steps per episode.
+    #    idle_limit=100 to define how many idle steps are allowed (if used in the environment).
+    env = OT2Env(display=True, max_cycles=2000, idle_limit=100)
+
+    # ------------------------------------------------------------------------------
+    # Generate a random goal and reset the environment with it
+    # ------------------------------------------------------------------------------
+    random_goal = generate_random_goal(position_bounds)
+    obs, _ = env.reset(options={"goal": random_goal})  # The first observation includes this goal
+    logger.info(f"Randomly Generated Goal: {random_goal}")
+
+    # ------------------------------------------------------------------------------
+    # Tracking variables for analysis
+    # ------------------------------------------------------------------------------
+    reward_history = []
+    distance_history = []
+    action_history = []
+    total_reward = 0
+
+    # ------------------------------------------------------------------------------
+    # Run the model for up to 2000 steps (or until goal is reached)
+    # ------------------------------------------------------------------------------
+    for step in range(2000):
+        # Add a short delay to slow down the simulation and observe it (only when watching)
+        if args.realtime:
+            time.sleep(0.1)  # 100ms delay per step
+
+        # Use the loaded PPO model to predict the next action in a deterministic manner
+        action, _ = model.predict(obs, deterministic=True)
     
-    # Apply the action in the environment
-    obs, reward, done, _, info = env.step(action)
+        # Apply the action in the environment
+        obs, reward, done, _, info = env.step(action)
     
-    # current_distance may be stored in info by the environment
-    current_distance = info.get("current_distance", None)
-    distance_history.append(current_distance)
-    action_history.append(action)
-    total_reward += reward
-
-    # Print step information for debugging and clarity
-    print(f"Step {step + 1}: Action = {action}, Reward = {reward:.4f}, Distance = {current_distance:.4f}")
-
-    # If the environment signals done, we conclude
-    if done:
-        print(f"Simulation ended at step {step + 1}. "
-              f"Final Reward: {total_reward:.4f}, "
-              f"Final Distance: {current_distance:.4f}")
-        reward_history.append(total_reward)
-        break
-
-# ------------------------------------------------------------------------------
-# After finishing, log all actions taken
-# ------------------------------------------------------------------------------
-print("\nActions Taken:")
-for i, action in enumerate(action_history, 1):
-    print(f"Step {i}: {action}")
-
-# ------------------------------------------------------------------------------
-# Close the environment to release resources
-# ------------------------------------------------------------------------------
-env.close()
+        # current_distance may be stored in info by the environment
+        current_distance = info.get("current_distance", None)
+        distance_history.append(current_distance)
+        action_history.append(action)
+        total_reward += reward
+
+        # Log step information for debugging and clarity (only formatted with --verbose)
+        logger.debug("Step %d: Action = %s, Reward = %.4f, Distance = %.4f",
+                     step + 1, action, reward, current_distance)
+
+        # If the environment signals done, we conclude
+        if done:
+            logger.info(f"Simulation ended at step {step + 1}. "
+                        f"Final Reward: {total_reward:.4f}, "
+                        f"Final Distance: {current_distance:.4f}")
+            reward_history.append(total_reward)
+            break
+
+    # ------------------------------------------------------------------------------
+    # After finishing, log all actions taken
+    # ------------------------------------------------------------------------------
+    # Build the whole listing first so it is written in a single call
+    actions_taken = "\n".join(f"Step {i}: {action}" for i, action in enumerate(action_history, 1))
+    logger.info(f"\nActions Taken:\n{actions_taken}")
+
+    # ------------------------------------------------------------------------------
+    # Close the environment to release resources
+    # ------------------------------------------------------------------------------
+    env.close()
+
+
+if __name__ == "__main__":
+    main()
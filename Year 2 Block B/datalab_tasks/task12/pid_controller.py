@@ -9,8 +9,53 @@ Typical usage:
     - Call the compute() method on each timestep, providing the current value 
       and the elapsed time (dt). 
     - Use the returned output to drive your control system (e.g., motor commands).
+
+For multi-axis control (x, y, z) use VectorPIDController, which keeps the gains and
+state of all axes in NumPy arrays and updates them in a single vectorized step.
+
+The arithmetic of a single PID update lives in _pid_step, which is compiled with
+Numba so the per-tick cost stays close to native code. The compiled function is
+cached on disk, so the compilation only happens on the first run.
 """
 
+import numpy as np
+from numba import njit
+
+
+@njit(cache=True, fastmath=True)
+def _pid_step(error, prev_error, integral, kp, ki, kd, dt, max_integral):
+    """
+    Performs one PID update on scalar values.
+
+    Args:
+        error (float): Difference between the setpoint and the current value.
+        prev_error (float): Error from the previous update.
+        integral (float): Accumulated integral term before this update.
+        kp (float): Proportional gain.
+        ki (float): Integral gain.
+        kd (float): Derivative gain.
+        dt (float): Time step (seconds) since the previous update.
+        max_integral (float): Anti-windup limit for the integral term.
+
+    Returns:
+        tuple: (output, new_integral, error) where error is to be stored as the
+               previous error for the next update.
+    """
+    # Update integral term and apply anti-windup. Plain conditional expressions
+    # instead of max(min(...)) avoid two builtin calls when the JIT is disabled
+    # (e.g. NUMBA_DISABLE_JIT=1 while debugging).
+    integral += error * dt
+    integral = integral if integral < max_integral else max_integral
+    integral = integral if integral > -max_integral else -max_integral
+
+    # Derivative term: rate of change of error
+    derivative = (error - prev_error) / dt if dt > 0 else 0.0
+
+    # Combine P, I, and D components
+    output = kp * error + ki * integral + kd * derivative
+    return output, integral, error
+
+
 class PIDController:
     def __init__(self, kp, ki, kd, setpoint=0):
         """
@@ -48,14 +93,66 @@ class PIDController:
             float: The control output that incorporates proportional, integral, and derivative terms.
         """
         # Calculate the error between setpoint and current value
-        error = self.setpoint - current_value
-        
+        error = float(self.setpoint - current_value)
+
+        # Run the compiled PID update and store the state for the next step
+        output, self.integral, self.prev_error = _pid_step(
+            error, float(self.prev_error), float(self.integral),
+            float(self.kp), float(self.ki), float(self.kd),
+            float(dt), float(self.max_integral),
+        )
+
+        # Return the control signal
+        return output
+
+
+class VectorPIDController:
+    def __init__(self, kp, ki, kd, setpoint=0, n_axes=3):
+        """
+        Initializes a PID Controller that drives several axes at once.
+
+        Args:
+            kp (float or array-like): Proportional gain, per axis or shared.
+            ki (float or array-like): Integral gain, per axis or shared.
+            kd (float or array-like): Derivative gain, per axis or shared.
+            setpoint (float or array-like, optional): Target value per axis. Defaults to 0.
+            n_axes (int, optional): Number of controlled axes. Defaults to 3 (x, y, z).
+        """
+        self.kp = np.broadcast_to(np.asarray(kp, dtype=np.float32), (n_axes,)).copy()
+        self.ki = np.broadcast_to(np.asarray(ki, dtype=np.float32), (n_axes,)).copy()
+        self.kd = np.broadcast_to(np.asarray(kd, dtype=np.float32), (n_axes,)).copy()
+        self.setpoint = np.broadcast_to(np.asarray(setpoint, dtype=np.float32), (n_axes,)).copy()
+
+        # Store the previous error for derivative calculation
+        self.prev_error = np.zeros(n_axes, dtype=np.float32)
+
+        # Integral term accumulates over time
+        self.integral = np.zeros(n_axes, dtype=np.float32)
+
+        # Anti-windup limit to prevent integral from growing too large
+        self.max_integral = 1.0
+
+    def compute(self, current_value, dt):
+        """
+        Computes the control output for all axes based on the current system values
+        and elapsed time.
+
+        Args:
+            current_value (array-like): The current measured value of each axis.
+            dt (float): Time step (seconds) since the last compute() call.
+
+        Returns:
+            np.ndarray: The control output for each axis.
+        """
+        # Calculate the error between setpoint and current value for every axis
+        error = self.setpoint - np.asarray(current_value, dtype=np.float32)
+
         # Update integral term and apply anti-windup
         self.integral += error * dt
-        self.integral = max(min(self.integral, self.max_integral), -self.max_integral)
-        
+        np.clip(self.integral, -self.max_integral, self.max_integral, out=self.integral)
+
         # Derivative term: rate of change of error
-        derivative = (error - self.prev_error) / dt if dt > 0 else 0
+        derivative = (error - self.prev_error) / dt if dt > 0 else 0.0
 
         # Combine P, I, and D components
         output = self.kp * error + self.ki * self.integral + self.kd * derivative
@@ -63,5 +160,5 @@ class PIDController:
         # Store current error for the next step
         self.prev_error = error
 
-        # Return the control signal
+        # Return the control signals
         return output
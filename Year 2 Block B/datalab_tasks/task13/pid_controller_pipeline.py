@@ -10,80 +10,27 @@ This script demonstrates a full pipeline that:
 Key components:
     - PIDControlledEnv: Provides x, y, z PID controllers in a Gym-like environment.
     - process_single_image: The CV function from 'task_8.py' that identifies tip locations.
-    - pixel_to_robot_coords: Converts from pixels to real-world (x, y, z) in meters, factoring in bounding/clamping.
-    - inoculate_tip: Issues repeated dispense commands to the environment to simulate inoculation.
+    - pixels_to_robot_coords, inoculate_tip, render_results: The pixel->robot conversion,
+      inoculation sequence and result plot shared with the RL pipeline (pipeline_utils.py).
     - main: Orchestrates the entire pipeline, one zone at a time.
 """
 
 import os
-import time
-import numpy as np
-import matplotlib.pyplot as plt
+import logging
+import argparse
 
 from pid_controlled_env import PIDControlledEnv
 from task_8 import process_single_image  # your CV pipeline
+from pipeline_utils import pixels_to_robot_coords, inoculate_tip, render_results
+
+logger = logging.getLogger(__name__)
 
 ##############################################################################
 # Config
 ##############################################################################
-PLATE_SIZE_MM = 150.0
-PLATE_ORIGIN = [0.10775, 0.062, 0.057]  # Same as your RL pipeline
-X_BOUNDS = (-0.1872, 0.2531)
-Y_BOUNDS = (-0.1711, 0.2201)
-Z_BOUNDS = (0.1691, 0.2896)
-
 DISTANCE_THRESHOLD = 0.001  # 1 mm
 MAX_STEPS_PER_TIP = 2000    # Same as RL
 
-def pixel_to_robot_coords(px, py, cropped_w_px):
-    """
-    Converts pixel coordinates (px, py) to the robot's (x, y, z) space in meters.
-    The function applies scaling based on the plate size and clamps coordinates 
-    according to specified workspace bounds (X_BOUNDS, Y_BOUNDS, Z_BOUNDS).
-
-    Args:
-        px (float): Pixel position along the x-axis (horizontal).
-        py (float): Pixel position along the y-axis (vertical).
-        cropped_w_px (float): The width of the cropped image in pixels, used to derive scaling.
-
-    Returns:
-        list of float: [rx, ry, rz], the robot coordinates in meters.
-    """
-    scale_mm_per_px = PLATE_SIZE_MM / float(cropped_w_px)
-    x_mm = px * scale_mm_per_px
-    y_mm = py * scale_mm_per_px
-
-    x_m = x_mm / 1000.0
-    y_m = y_mm / 1000.0
-
-    rx = PLATE_ORIGIN[0] + x_m
-    ry = PLATE_ORIGIN[1] + y_m
-    rz = Z_BOUNDS[0]
-
-    # Clamp to the valid workspace bounds
-    rx = np.clip(rx, X_BOUNDS[0], X_BOUNDS[1])
-    ry = np.clip(ry, Y_BOUNDS[0], Y_BOUNDS[1])
-    rz = np.clip(rz, Z_BOUNDS[0], Z_BOUNDS[1])
-
-    return [rx, ry, rz]
-
-def inoculate_tip(env, steps=10, sleep_time=0.05):
-    """
-    Simulates an inoculation sequence by repeatedly issuing dispense=1 commands with zero velocity.
-
-    Args:
-        env (PIDControlledEnv): The environment controlling the pipette.
-        steps (int, optional): Number of steps to spend dispensing. Defaults to 10.
-        sleep_time (float, optional): Delay (seconds) between dispense actions. Defaults to 0.05.
-    """
-    print("    => Starting multi-step inoculation sequence...")
-    for i in range(steps):
-        velocity_action = [0.0, 0.0, 0.0]
-        sim_action = velocity_action + [1]  # 4th => 'dispense=1'
-        env.env.sim.run([sim_action])
-        time.sleep(sleep_time)
-    print("    => Finished inoculation steps.\n")
-
 def main():
     """
     Main pipeline:
@@ -95,34 +42,44 @@ def main():
       6) Inoculates if the goal is reached.
       7) Shows a final pipeline image with tips highlighted, then closes the environment.
     """
+    # Pipeline progress is logged at INFO, per-step/debug details with --verbose
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--verbose", action="store_true", help="Log per-step and debug details")
+    args, _ = parser.parse_known_args()
+    logging.basicConfig(format="%(message)s")
+    logger.setLevel(logging.DEBUG if args.verbose else logging.INFO)
+    logging.getLogger("pipeline_utils").setLevel(logger.level)
+
     # 1) Create your PID env w/ slow movement
     env = PIDControlledEnv(render=True, max_steps=MAX_STEPS_PER_TIP, idle_limit=300)
 
     # 2) Acquire the plate image
     image_path = env.env.get_plate_image()
-    print(f"Plate image => {image_path}")
+    logger.info(f"Plate image => {image_path}")
 
     # 3) CV => zone_points
     zone_points = process_single_image(image_path, exclude_top_px=500, visualize=False)
     cropped_w_px = 2000.0  # e.g., final cropped size
 
-    print("DEBUG: zone_points in pixel coords =>", zone_points)
+    logger.debug(f"zone_points in pixel coords => {zone_points}")
 
     all_distances = []
 
+    # Convert pixel->robot for all zones with a tip in one call
+    tips = {zone_id: zone_points[zone_id] for zone_id in range(1, 6) if zone_points.get(zone_id) is not None}
+    robot_goals = dict(zip(tips, pixels_to_robot_coords(list(tips.values()), cropped_w_px).tolist()))
+
     # 4) For each zone, move & inoculate
     for zone_id in range(1, 6):
-        tip = zone_points.get(zone_id)
-        if tip is None:
-            print(f"Zone {zone_id} => no tip found, skipping...\n")
+        if zone_id not in tips:
+            logger.info(f"Zone {zone_id} => no tip found, skipping...\n")
             continue
 
-        px, py = tip
-        print(f"Zone {zone_id} => pixel=({px},{py}).")
+        px, py = tips[zone_id]
+        logger.info(f"Zone {zone_id} => pixel=({px},{py}).")
 
-        # Convert pixel->robot
-        goal_robot = pixel_to_robot_coords(px, py, cropped_w_px)
-        print(f" => Robot Goal => {goal_robot}\n")
+        goal_robot = robot_goals[zone_id]
+        logger.info(f" => Robot Goal => {goal_robot}\n")
 
         # 5) Set the environment's goal
         env.set_goal(goal_robot)
@@ -132,16 +89,16 @@ def main():
 
         # 7) If reached => inoculate
         if reached:
-            inoculate_tip(env, steps=10, sleep_time=0.05)
+            inoculate_tip(env.env, steps=10, sleep_time=0.05)
         else:
-            print(f"Zone {zone_id} => Did NOT reach the tip (timeout or stuck).\n")
+            logger.info(f"Zone {zone_id} => Did NOT reach the tip (timeout or stuck).\n")
 
     # 8) (Optional) Show final pipeline with tips
-    print("\n-- Now showing final pipeline w/ tips --")
-    process_single_image(image_path, exclude_top_px=500, visualize=True)
+    logger.info("\n-- Now showing final pipeline w/ tips --")
+    render_results(image_path, zone_points)
 
     env.close()
-    print("Finished all zones with slow PID controller.")
+    logger.info("Finished all zones with slow PID controller.")
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,145 @@
+"""
+This module holds the parts shared by the PID and RL controller pipelines:
+- The plate and workspace configuration (PLATE_SIZE_MM, PLATE_ORIGIN, X/Y/Z_BOUNDS).
+- pixels_to_robot_coords / pixel_to_robot_coords: Convert pixel coordinates from the
+  cropped plate image to robot (x, y, z) coordinates in meters, clamped to the workspace.
+- inoculate_tip: Issues repeated dispense commands to an OT2Env to simulate inoculation.
+- render_results: Shows the plate image and the detected tips without re-running the CV pipeline.
+"""
+
+import time
+import logging
+import numpy as np
+from numba import njit
+import matplotlib.pyplot as plt
+
+logger = logging.getLogger(__name__)
+
+##############################################################################
+# Config
+##############################################################################
+PLATE_SIZE_MM = 150.0
+PLATE_ORIGIN = [0.10775, 0.088 - 0.026, 0.057]  # => [0.10775, 0.062, 0.057]
+X_BOUNDS = (-0.1872, 0.2531)
+Y_BOUNDS = (-0.1711, 0.2201)
+Z_BOUNDS = (0.1691, 0.2896)
+
+# Workspace bounds and plate origin as arrays, passed to the compiled
+# _pixels_to_robot kernel
+_LO = np.array([X_BOUNDS[0], Y_BOUNDS[0], Z_BOUNDS[0]], dtype=np.float64)
+_HI = np.array([X_BOUNDS[1], Y_BOUNDS[1], Z_BOUNDS[1]], dtype=np.float64)
+_ORIGIN = np.array([PLATE_ORIGIN[0], PLATE_ORIGIN[1], Z_BOUNDS[0]], dtype=np.float64)
+
+@njit(cache=True, fastmath=True)
+def _pixels_to_robot(pixels, scale_m_per_px, origin, lo, hi):
+    """
+    Converts an (N, 2) array of pixel coordinates to an (N, 3) array of robot
+    coordinates: offset from the plate origin (z stays at the origin's z), then
+    clamped to the workspace bounds.
+    """
+    robot_xyz = np.empty((pixels.shape[0], 3))
+    for i in range(pixels.shape[0]):
+        for axis in range(3):
+            value = origin[axis]
+            if axis < 2:
+                value += scale_m_per_px * pixels[i, axis]
+            robot_xyz[i, axis] = min(max(value, lo[axis]), hi[axis])
+    return robot_xyz
+
+def pixels_to_robot_coords(pixel_coords, cropped_w_px):
+    """
+    Converts several pixel coordinates at once to the robot's coordinate system,
+    in a single call of the compiled _pixels_to_robot kernel.
+
+    Args:
+        pixel_coords (sequence): (px, py) pixel coordinates, one pair per tip.
+        cropped_w_px (float): Width of the cropped plate image in pixels, used
+                              to determine mm/px scaling.
+
+    Returns:
+        np.ndarray: (N, 3) array of robot coordinates [rx, ry, rz] in meters,
+                    clamped to the defined workspace bounds.
+    """
+    # Plate scale in meters per pixel
+    scale_m_per_px = PLATE_SIZE_MM / 1000.0 / float(cropped_w_px)
+    pixels = np.asarray(pixel_coords, dtype=np.float64).reshape(-1, 2)
+    return _pixels_to_robot(pixels, scale_m_per_px, _ORIGIN, _LO, _HI)
+
+def pixel_to_robot_coords(px, py, cropped_w_px):
+    """
+    Converts a pixel coordinate (px, py) from the plate image to the robot's
+    coordinate system (x, y, z) in meters. The function applies a scaling factor
+    derived from plate size in millimeters (PLATE_SIZE_MM) and the width of the
+    cropped image (cropped_w_px). The z-coordinate is chosen as the lower Z bound
+    for simplicity, but can be modified as needed. Finally, all coordinates are
+    clamped to the valid workspace bounds.
+
+    Args:
+        px (float): Pixel x-coordinate.
+        py (float): Pixel y-coordinate.
+        cropped_w_px (float): Width of the cropped plate image in pixels, used
+                              to determine mm/px scaling.
+
+    Returns:
+        list of float: [rx, ry, rz], the robot coordinates in meters, clamped to
+                       the defined workspace bounds.
+    """
+    return pixels_to_robot_coords([(px, py)], cropped_w_px)[0].tolist()
+
+def inoculate_tip(env, steps=10, sleep_time=0.05):
+    """
+    Conducts an inoculation sequence by sending dispense=1 commands to the environment
+    multiple times, with zero velocity. This allows a visual indication of dispensing
+    in the simulation (e.g., PyBullet).
+
+    Args:
+        env (OT2Env): The simulation environment instance (for the PID pipeline, the
+                      OT2Env wrapped by PIDControlledEnv).
+        steps (int, optional): Number of dispensing steps. Defaults to 10.
+        sleep_time (float, optional): Delay in seconds between dispense actions when
+                                      rendering. Defaults to 0.05.
+    """
+    logger.info("    => Starting multi-step inoculation sequence...")
+    velocity_action = [0.0, 0.0, 0.0]   # No movement
+    sim_action = velocity_action + [1] # 4th index => 'dispense=1'
+
+    if env.render:
+        # Step one at a time with a short sleep so the dispensing is visible
+        for i in range(steps):
+            env.sim.run([sim_action])
+            time.sleep(sleep_time)
+    else:
+        # Headless: let the simulation step all dispense actions in a single call
+        env.sim.run([sim_action], num_steps=steps)
+    logger.info("    => Finished inoculation steps.\n")
+
+def render_results(image_path, zone_points):
+    """
+    Shows the plate image next to the tip positions found by the CV pipeline. The
+    zone_points from the first process_single_image call are reused, so the image
+    does not have to be processed a second time just to draw the result.
+
+    Args:
+        image_path (str): Path to the plate image that was processed.
+        zone_points (dict): Mapping of zone id to the (px, py) tip position in the
+                            cropped plate image, as returned by process_single_image.
+    """
+    fig, (ax_img, ax_tips) = plt.subplots(1, 2, figsize=(12, 6))
+
+    ax_img.imshow(plt.imread(image_path))
+    ax_img.set_title("Plate image")
+    ax_img.axis("off")
+
+    for zone_id, tip in sorted(zone_points.items()):
+        if tip is None:
+            continue
+        px, py = tip
+        ax_tips.scatter(px, py, color="red")
+        ax_tips.annotate(f"Zone {zone_id}", (px, py), textcoords="offset points", xytext=(5, 5))
+    # Match the image orientation (origin in the top left corner)
+    ax_tips.invert_yaxis()
+    ax_tips.set_aspect("equal")
+    ax_tips.set_title("Root tips (pixel coords)")
+
+    plt.tight_layout()
+    plt.show()
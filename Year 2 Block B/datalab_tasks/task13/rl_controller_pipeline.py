@@ -4,201 +4,224 @@ model to navigate an OT2Env environment and inoculate root tips at specified zon
 The main steps are:
 
 1. Load a trained PPO model from a file (MODEL_PATH).
-2. Initialize the OT2Env environment with rendering enabled and a maximum step limit.
-3. Acquire an image of the plate from the environment (env.get_plate_image).
-4. Process the image (process_single_image) to locate root tips in pixel coordinates.
-5. Convert each pixel coordinate to robot coordinates (via pixel_to_robot_coords).
-6. For each zone:
-   a. Set the goal position in the environment and reset.
-   b. Let the PPO model select actions at each timestep.
-   c. Check the distance to the goal and stop when threshold is reached or max steps/truncation occurs.
-   d. Inoculate the tip with repeated dispense actions if the goal is successfully reached.
-7. Display the final image with tips for visualization and close the environment.
+2. Initialize an OT2Env environment and acquire an image of the plate from it (env.get_plate_image).
+3. Process the image (process_single_image) to locate root tips in pixel coordinates.
+4. Convert each pixel coordinate to robot coordinates (via pixel_to_robot_coords).
+5. Move to all zones at once, with one OT2Env per zone in a SubprocVecEnv:
+   a. Every environment (ZoneEnv) resets to the goal position of its own zone.
+   b. The PPO model selects the actions of all zones in one batched predict call per timestep.
+   c. An environment inoculates its tip with repeated dispense actions as soon as the
+      distance threshold is reached; a zone stops there or on max steps/truncation.
+6. Display the final image with tips for visualization and close the environments.
+
+The environments are rendered (one simulation window per zone) unless the script
+is run with --headless.
 
 Configuration and constants (PLATE_SIZE_MM, PLATE_ORIGIN, X_BOUNDS, etc.) define the 
 workspace and coordinate transformations between pixels and the robot's coordinate system.
+They live in pipeline_utils.py together with the conversion, inoculation and plotting
+helpers shared with the PID pipeline.
 """
 
 import os
-import time
+import logging
+import argparse
 import numpy as np
-import matplotlib.pyplot as plt
+import torch
+import gymnasium as gym
 
 from stable_baselines3 import PPO
+from stable_baselines3.common.vec_env import SubprocVecEnv
 from ot2_gym_wrapper import OT2Env  # Environment that stops when distance < 0.001
 from task_8 import process_single_image  # Your CV pipeline
+from pipeline_utils import pixels_to_robot_coords, inoculate_tip, render_results
+
+logger = logging.getLogger(__name__)
 
 ##############################################################################
 # Config
 ##############################################################################
-PLATE_SIZE_MM = 150.0
-PLATE_ORIGIN = [0.10775, 0.088 - 0.026, 0.057]  # => [0.10775, 0.062, 0.057]
-X_BOUNDS = (-0.1872, 0.2531)
-Y_BOUNDS = (-0.1711, 0.2201)
-Z_BOUNDS = (0.1691, 0.2896)
-
 DISTANCE_THRESHOLD = 0.001   # 1 mm
 MAX_STEPS_PER_TIP = 2000
 
 # Path to a trained PPO model file
 MODEL_PATH = r"C:\Users\Michon\Documents\GitHub\2024-25b-fai2-adsai-MichonGoddijn231849\datalab_tasks\task11\models\dkj26bvp\best_model.zip"
 
-def pixel_to_robot_coords(px, py, cropped_w_px):
+class ZoneEnv(gym.Wrapper):
     """
-    Converts a pixel coordinate (px, py) from the plate image to the robot's 
-    coordinate system (x, y, z) in meters. The function applies a scaling factor 
-    derived from plate size in millimeters (PLATE_SIZE_MM) and the width of the 
-    cropped image (cropped_w_px). The z-coordinate is chosen as the lower Z bound 
-    for simplicity, but can be modified as needed. Finally, all coordinates are 
-    clamped to the valid workspace bounds.
-
-    Args:
-        px (float): Pixel x-coordinate.
-        py (float): Pixel y-coordinate.
-        cropped_w_px (float): Width of the cropped plate image in pixels, used 
-                              to determine mm/px scaling.
-
-    Returns:
-        list of float: [rx, ry, rz], the robot coordinates in meters, clamped to 
-                       the defined workspace bounds.
+    Wraps an OT2Env for a single zone: the goal is pinned to the zone's tip, so every
+    reset moves towards the same goal, and the tip is inoculated as soon as the pipette
+    is within DISTANCE_THRESHOLD of it. This happens inside the (worker) environment,
+    before the VecEnv auto-resets it.
     """
-    scale_mm_per_px = PLATE_SIZE_MM / float(cropped_w_px)
-    x_mm = px * scale_mm_per_px
-    y_mm = py * scale_mm_per_px
-
-    x_m = x_mm / 1000.0
-    y_m = y_mm / 1000.0
 
-    rx = PLATE_ORIGIN[0] + x_m
-    ry = PLATE_ORIGIN[1] + y_m
-    rz = Z_BOUNDS[0]  # By default, take the lower bound of the Z range
+    def __init__(self, env, goal):
+        super().__init__(env)
+        env.set_target(goal)
 
-    # Clamp the coordinates within the defined bounds
-    rx = np.clip(rx, X_BOUNDS[0], X_BOUNDS[1])
-    ry = np.clip(ry, Y_BOUNDS[0], Y_BOUNDS[1])
-    rz = np.clip(rz, Z_BOUNDS[0], Z_BOUNDS[1])
+    def step(self, action):
+        obs, reward, terminated, truncated, info = self.env.step(action)
 
-    return [rx, ry, rz]
+        # OT2Env's reward is the negative distance to the goal
+        info["current_distance"] = -reward
+        if info["current_distance"] < DISTANCE_THRESHOLD:
+            # Inoculate the root tip (multi-step) and end the episode
+            inoculate_tip(self.env, steps=10, sleep_time=0.05)
+            info["inoculated"] = True
+            terminated = True
+        return obs, reward, terminated, truncated, info
 
-def inoculate_tip(env, steps=10, sleep_time=0.05):
+def make_env(goal, render=True):
     """
-    Conducts an inoculation sequence by sending dispense=1 commands to the environment 
-    multiple times, with zero velocity. This allows a visual indication of dispensing 
-    in the simulation (e.g., PyBullet).
-
-    Args:
-        env (OT2Env): The simulation environment instance.
-        steps (int, optional): Number of dispensing steps. Defaults to 10.
-        sleep_time (float, optional): Delay in seconds between dispense actions. Defaults to 0.05.
+    Returns a function that creates an OT2Env for the zone at `goal`, as expected
+    by SubprocVecEnv. Every worker is its own process, so each rendered zone gets
+    its own simulation window.
     """
-    print("    => Starting multi-step inoculation sequence...")
-    for i in range(steps):
-        velocity_action = [0.0, 0.0, 0.0]   # No movement
-        sim_action = velocity_action + [1] # 4th index => 'dispense=1'
-        env.sim.run([sim_action])
-
-        # Sleep briefly for rendering
-        time.sleep(sleep_time)
-    print("    => Finished inoculation steps.\n")
+    def _init():
+        return ZoneEnv(OT2Env(render=render, max_steps=MAX_STEPS_PER_TIP), goal)
+    return _init
 
 def main():
     """
     The main function orchestrates the following:
       1. Load the trained PPO model.
-      2. Initialize the OT2Env environment (with rendering).
-      3. Capture or retrieve a plate image from the environment.
-      4. Process the image (process_single_image) to identify tip positions in pixel coords.
-      5. For each tip's coordinates:
-         a. Convert them to robot coordinates.
-         b. Set the environment's target position, then reset.
-         c. Run the PPO policy until the distance threshold or max steps is reached.
-         d. Inoculate the tip if within the threshold.
-      6. Display the final pipeline image with tips, then close the environment.
+      2. Capture or retrieve a plate image from an OT2Env environment.
+      3. Process the image (process_single_image) to identify tip positions in pixel coords.
+      4. Convert each tip's coordinates to robot coordinates.
+      5. Run all zones at once in a SubprocVecEnv (one ZoneEnv per zone):
+         a. Predict the actions of all zones with one batched PPO call per step.
+         b. Each zone inoculates its tip when it gets within the threshold, and
+            stops there or on max steps/truncation.
+      6. Display the final pipeline image with tips, then close the environments.
     """
+    # Pipeline progress is logged at INFO, per-step/debug details with --verbose
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--verbose", action="store_true", help="Log per-step and debug details")
+    parser.add_argument("--headless", action="store_true",
+                        help="Run the simulations without rendering (no visual rollout or dispensing)")
+    args, _ = parser.parse_known_args()
+    logging.basicConfig(format="%(message)s")
+    logger.setLevel(logging.DEBUG if args.verbose else logging.INFO)
+    logging.getLogger("pipeline_utils").setLevel(logger.level)
+
     # 1) Load PPO model
     model = PPO.load(MODEL_PATH)
-    print(f"Loaded PPO from: {MODEL_PATH}")
+    logger.info(f"Loaded PPO from: {MODEL_PATH}")
 
-    # 2) Create the environment
-    env = OT2Env(render=True, max_steps=MAX_STEPS_PER_TIP)
-
-    # 3) Acquire the plate image
+    # 2) Acquire the plate image
+    env = OT2Env(render=not args.headless, max_steps=MAX_STEPS_PER_TIP)
     image_path = env.get_plate_image()
-    print(f"Plate image: {image_path}")
+    logger.info(f"Plate image: {image_path}")
+    env.close()
 
-    # 4) Run CV pipeline => zone_points
+    # 3) Run CV pipeline => zone_points
     zone_points = process_single_image(image_path, exclude_top_px=500, visualize=False)
 
     # Assume final cropped plate is about 2000 pixels wide
     cropped_w_px = 2000.0
 
-    print("DEBUG: zone_points in pixel coords =>", zone_points)
+    logger.debug(f"zone_points in pixel coords => {zone_points}")
 
-    all_distances = []
-    all_rewards = []
-
-    # 5) For each zone, move & inoculate
+    # 4) Convert the tip of every zone to a robot goal
+    tips = {}
     for zone_id in range(1, 6):
         tip = zone_points.get(zone_id)
         if tip is None:
-            print(f"Zone {zone_id} => no tip found, skipping...\n")
+            logger.info(f"Zone {zone_id} => no tip found, skipping...\n")
             continue
 
         px, py = tip
-        print(f"Zone {zone_id} => pixel=({px},{py}).")
-
-        # Convert pixel->robot
-        goal_robot = pixel_to_robot_coords(px, py, cropped_w_px)
-        print(f" => Robot Goal => {goal_robot}\n")
-
-        # Set the environment's target, then reset
-        env.target_position = np.array(goal_robot, dtype=np.float32)
-        obs, _ = env.reset()
-
-        total_reward = 0.0
+        logger.info(f"Zone {zone_id} => pixel=({px},{py}).")
+        tips[zone_id] = tip
+
+    # Convert pixel->robot for all zones in one call
+    robot_goals = pixels_to_robot_coords(list(tips.values()), cropped_w_px)
+    goals = dict(zip(tips, robot_goals.tolist()))
+    for zone_id, goal_robot in goals.items():
+        logger.info(f"Zone {zone_id} => Robot Goal => {goal_robot}\n")
+
+    # 5) Move & inoculate all zones at once, one environment per zone
+    zone_ids = list(goals)
+    if zone_ids:
+        venv = SubprocVecEnv([make_env(goals[zone_id], render=not args.headless) for zone_id in zone_ids])
+        obs = venv.reset()
+
+        # Query the policy network directly instead of model.predict, which builds a
+        # new tensor from the observations on every call. The observations are copied
+        # into one preallocated tensor on the policy's device instead. (OT2Env clips
+        # the actions itself, so predict's action clipping isn't needed either.)
+        policy = model.policy
+        policy.set_training_mode(False)
+        obs_t = torch.empty(obs.shape, dtype=torch.float32, device=policy.device)
+
+        # Zones that are still moving towards their tip
+        active = np.ones(len(zone_ids), dtype=bool)
+        total_rewards = np.zeros(len(zone_ids))
+
+        # Per-step distance/reward of every zone, preallocated (NaN once a zone is done)
+        all_distances = np.full((MAX_STEPS_PER_TIP, len(zone_ids)), np.nan)
+        all_rewards = np.full((MAX_STEPS_PER_TIP, len(zone_ids)), np.nan)
 
         for step in range(MAX_STEPS_PER_TIP):
-            # RL model picks the next action
-            action, _ = model.predict(obs, deterministic=True)
-            obs, reward, done, truncated, info = env.step(action)
-
-            total_reward += reward
-            all_rewards.append(reward)
-
-            current_distance = info.get("current_distance", None)
-            all_distances.append(current_distance)
-
-            print(
-                f"Step {step}: dist={current_distance:.4f}, "
-                f"reward={reward:.4f}, action={action}"
+            # RL model picks the next action of every zone in one batched call
+            obs_t.copy_(torch.from_numpy(obs))
+            with torch.no_grad():
+                actions = policy._predict(obs_t, deterministic=True).cpu().numpy()
+            # Finished zones have been auto-reset by the VecEnv; keep them in place
+            actions[~active] = 0.0
+            obs, rewards, dones, infos = venv.step(actions)
+
+            distances = np.array([info["current_distance"] for info in infos])
+            all_distances[step, active] = distances[active]
+            all_rewards[step, active] = rewards[active]
+            total_rewards[active] += rewards[active]
+
+            # Per-step details only with --verbose (lazy %-formatting)
+            logger.debug(
+                "Step %d: zones=%s, dist=%s, reward=%s",
+                step, zone_ids, distances, rewards
             )
 
-            # Check threshold => 1 mm
-            if current_distance < DISTANCE_THRESHOLD:
-                print(
-                    f"  => Reached tip zone {zone_id} at step={step}, "
-                    f"distance={current_distance:.4f}, total_reward={total_reward:.4f}"
-                )
-                # Inoculate the root tip (multi-step)
-                inoculate_tip(env, steps=10, sleep_time=0.05)
+            for i in np.flatnonzero(active):
+                zone_id = zone_ids[i]
+                current_distance = distances[i]
+
+                # Check threshold => 1 mm (the tip was inoculated by ZoneEnv)
+                if infos[i].get("inoculated"):
+                    logger.info(
+                        f"  => Reached tip zone {zone_id} at step={step}, "
+                        f"distance={current_distance:.4f}, total_reward={total_rewards[i]:.4f}"
+                    )
+                    active[i] = False
+                elif dones[i]:
+                    logger.info(
+                        f"  => Zone {zone_id}: env done or idle-limit. "
+                        f"Distance={current_distance:.4f}, total_reward={total_rewards[i]:.4f}\n"
+                    )
+                    active[i] = False
+
+            if not active.any():
                 break
 
-            if done or truncated:
-                print(
-                    f"  => Env done or idle-limit. "
-                    f"Distance={current_distance:.4f}, total_reward={total_reward:.4f}\n"
-                )
-                break
+        for i in np.flatnonzero(active):
+            logger.info(f"Zone {zone_ids[i]} => Did NOT reach the tip within {MAX_STEPS_PER_TIP} steps.\n")
+
+        # One summary line per zone from the recorded distances
+        for i, zone_id in enumerate(zone_ids):
+            n_steps = int(np.count_nonzero(~np.isnan(all_distances[:, i])))
+            logger.info(
+                f"Zone {zone_id} summary: steps={n_steps}, "
+                f"min_distance={np.nanmin(all_distances[:, i]):.4f}, total_reward={total_rewards[i]:.4f}"
+            )
 
-            time.sleep(0.1)
+        # Close the environments
+        venv.close()
 
     # 6) Visualize the final pipeline with tips
-    print("\n-- Now showing final pipeline w/ tips --")
-    process_single_image(image_path, exclude_top_px=500, visualize=True)
+    logger.info("\n-- Now showing final pipeline w/ tips --")
+    render_results(image_path, zone_points)
 
-    # Close the environment
-    env.close()
-    print("Finished all zones.")
+    logger.info("Finished all zones.")
 
 if __name__ == "__main__":
     main()
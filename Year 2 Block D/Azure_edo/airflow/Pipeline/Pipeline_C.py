@@ -15,7 +15,6 @@ from component import (
     evaluate_comp,
     visualize_comp,
     register_comp,
-    deploy_comp,
 )
 
 # ── service principal (use Key Vault or env vars in prod) ────────────
@@ -35,6 +34,13 @@ ml_client = MLClient(
     workspace_name=os.getenv("AZURE_WORKSPACE", "NLP1-2025"),
 )
 
+# ── compute targets ──────────────────────────────────────────────────
+# Only train/evaluate need a GPU. Everything else can go to a CPU cluster,
+# so e.g. the loss-curve plot runs next to evaluate instead of queueing
+# behind it on the GPU node. Both default to the shared lambda node.
+GPU_COMPUTE = os.getenv("AZURE_GPU_COMPUTE", "adsai-lambda-0")
+CPU_COMPUTE = os.getenv("AZURE_CPU_COMPUTE", "adsai-lambda-0")
+
 
 def _resolve_csv_path() -> str:
     parser = argparse.ArgumentParser(add_help=False)
@@ -52,53 +58,48 @@ csv_input = Input(type="uri_file", path=CSV_PATH, mode="download")
 
 
 @pipeline(
-    default_compute="adsai-lambda-0",
+    default_compute=CPU_COMPUTE,
     code=".",  # bundle everything in this Pipeline/ folder
     tags={"pipeline": "emotion"},
 )
 def emotion_pipeline(raw_csv):
     # 0️⃣ Champion lookup
     best = get_best_model_comp(model_name="core-emotion-model")
-    best.compute = "adsai-lambda-0"
+    best.compute = CPU_COMPUTE
 
     # 1️⃣ Preprocess
     pre = preprocess_comp(raw_df=raw_csv)
-    pre.compute = "adsai-lambda-0"
+    pre.compute = CPU_COMPUTE
 
     # 2️⃣ Train (warm-start + sweep)
     tr = train_comp(
         base_model_dir=best.outputs.best_model_dir,
-        train_texts=pre.outputs.train_texts,
-        train_labels=pre.outputs.train_labels,
+        data=pre.outputs.data,
     )
-    tr.compute = "adsai-lambda-0"
+    tr.compute = GPU_COMPUTE
     tr.resources = {"instance_type": "gpu"}
 
     # 3️⃣ Evaluate
     ev = evaluate_comp(
         model_dir=tr.outputs.model_dir,
-        test_texts=pre.outputs.test_texts,
-        test_labels=pre.outputs.test_labels,
+        data=pre.outputs.data,
     )
-    ev.compute = "adsai-lambda-0"
+    ev.compute = GPU_COMPUTE
     ev.resources = {"instance_type": "gpu"}
 
-    # 4️⃣ Visualize loss curve
+    # 4️⃣ Visualize loss curve (only needs train's log history, so it runs
+    #    in parallel with evaluate)
     vi = visualize_comp(log_history=tr.outputs.log_history)
-    vi.compute = "adsai-lambda-0"
+    vi.compute = CPU_COMPUTE
     vi.outputs.loss_curve_png = Output(type="uri_file", mode="upload")
 
-    # 5️⃣ Register if improved
+    # 5️⃣ Register if improved, then deploy the champion (same step)
     reg = register_comp(
         model_dir=tr.outputs.model_dir,
         model_name="core-emotion-model",
         metrics_json=ev.outputs.metrics_json,
     )
-    reg.compute = "adsai-lambda-0"
-
-    # 6️⃣ Deploy
-    dep = deploy_comp(model_id_file=reg.outputs.registered_model)
-    dep.compute = "adsai-lambda-0"
+    reg.compute = CPU_COMPUTE
 
     return {
         "metrics": ev.outputs.metrics_json,
@@ -110,6 +111,8 @@ def emotion_pipeline(raw_csv):
 if __name__ == "__main__":
     print(f"🚀 Submitting pipeline with CSV → {CSV_PATH}")
     job = emotion_pipeline(raw_csv=csv_input)
-    job.settings = PipelineJobSettings(force_rerun=False)
+    job.settings = PipelineJobSettings(
+        force_rerun=False, continue_on_step_failure=False
+    )
     created = ml_client.jobs.create_or_update(job, stream=True)
     print("✅ Pipeline submitted →", created.name)
@@ -0,0 +1,36 @@
+# champion.py  (shared champion lookup for get_best_model_comp / register_model)
+# ------------------------------------------------------------
+# register_model.py only registers a new version when it beats the current
+# champion, and tags it with is_champion=true. So the champion is simply the
+# latest version, which is a single `models.get` call instead of listing and
+# scanning every version in the registry.
+from azure.core.exceptions import ResourceNotFoundError
+
+CHAMPION_TAG = "is_champion"
+
+
+def _f1(model) -> float:
+    try:
+        return float(model.tags.get("f1", 0.0))
+    except (ValueError, TypeError):
+        return 0.0
+
+
+def find_champion(ml, model_name: str):
+    """Return (best_f1, (name, version)), or (0.0, None) if nothing is registered."""
+    try:
+        latest = ml.models.get(name=model_name, label="latest")
+    except ResourceNotFoundError:
+        return 0.0, None
+
+    if latest.tags.get(CHAMPION_TAG) == "true":
+        return _f1(latest), (latest.name, latest.version)
+
+    # latest version wasn't registered by register_model.py (older or manual
+    # registration) → fall back to scanning the f1 tag of every version
+    best_f1, best_pair = 0.0, None
+    for m in ml.models.list(name=model_name):
+        f1 = _f1(m)
+        if f1 > best_f1:
+            best_f1, best_pair = f1, (m.name, m.version)
+    return best_f1, best_pair
@@ -1,11 +1,14 @@
 #!/usr/bin/env python3
 """
 deploy_model.py — blue/green rollout using your prebuilt y2bd-k8s-env:4
+
+deploy() is also called by register_model.py, which deploys the model it just
+registered without writing and re-reading a name:version file in between.
 """
 
 import argparse
 import os
-from azure.identity import DefaultAzureCredential
+from azure.identity import ManagedIdentityCredential
 from azure.ai.ml import MLClient
 from azure.ai.ml.entities import (
     ManagedOnlineEndpoint,
@@ -43,65 +46,88 @@ def parse_args():
     return p.parse_args()
 
 
-def main():
-    args = parse_args()
-
-    # Authenticate
-    ml_client = MLClient(
-        DefaultAzureCredential(),
-        subscription_id=args.subscription_id,
-        resource_group_name=args.resource_group,
-        workspace_name=args.workspace_name,
-    )
-
-    # Read the registered model name and version
-    name, version = open(args.model_id_file).read().strip().split(":")
-    print(f"▶️  Deploying model {name}:{version}")
-    model = ml_client.models.get(name=name, version=version)
-
+def deploy(
+    ml_client,
+    model,
+    endpoint_name,
+    deployment_name="green",
+    code_dir="./src",
+    scoring_script="score.py",
+    instance_type="gpu",
+    instance_count=1,
+):
+    """Deploy `model` (a registered Model) to the endpoint and route all traffic to it."""
     # Grab your prebuilt K8S environment
     built_env = ml_client.environments.get(name="y2bd-k8s-env", version="4")
 
     # Ensure the endpoint exists (or create it)
     try:
-        endpoint = ml_client.online_endpoints.get(args.endpoint_name)
-        print(f"ℹ️  Endpoint '{args.endpoint_name}' found")
+        endpoint = ml_client.online_endpoints.get(endpoint_name)
+        print(f"ℹ️  Endpoint '{endpoint_name}' found")
     except ResourceNotFoundError:
-        print(f"ℹ️  Creating endpoint '{args.endpoint_name}'")
-        endpoint = ManagedOnlineEndpoint(name=args.endpoint_name, auth_mode="key")
+        print(f"ℹ️  Creating endpoint '{endpoint_name}'")
+        endpoint = ManagedOnlineEndpoint(name=endpoint_name, auth_mode="key")
         ml_client.begin_create_or_update(endpoint).result()
 
     # Delete any prior 'green' deployment
     try:
         ml_client.online_deployments.begin_delete(
-            name=args.deployment_name,
-            endpoint_name=args.endpoint_name,
+            name=deployment_name,
+            endpoint_name=endpoint_name,
         ).result()
-        print(f"⚠️  Removed old deployment '{args.deployment_name}'")
+        print(f"⚠️  Removed old deployment '{deployment_name}'")
     except ResourceNotFoundError:
         # nothing to delete if it's not there
         pass
 
     # Create the new Kubernetes deployment
     dep = KubernetesOnlineDeployment(
-        name=args.deployment_name,
-        endpoint_name=args.endpoint_name,
+        name=deployment_name,
+        endpoint_name=endpoint_name,
         model=model,
         environment=built_env,
         code_configuration=CodeConfiguration(
-            code=args.code_dir,
-            scoring_script=args.scoring_script,
+            code=code_dir,
+            scoring_script=scoring_script,
         ),
-        instance_type=args.instance_type,
-        instance_count=args.instance_count,
+        instance_type=instance_type,
+        instance_count=instance_count,
     )
     ml_client.online_deployments.begin_create_or_update(dep).result()
-    print(f"✅ Deployed '{args.deployment_name}' with {version}")
+    print(f"✅ Deployed '{deployment_name}' with {model.version}")
 
     # Flip traffic: 100% to the new green deployment
-    endpoint.traffic = {args.deployment_name: 100}
+    endpoint.traffic = {deployment_name: 100}
     ml_client.begin_create_or_update(endpoint).result()
-    print(f"✅ Traffic routed: 100% → '{args.deployment_name}'")
+    print(f"✅ Traffic routed: 100% → '{deployment_name}'")
+
+
+def main():
+    args = parse_args()
+
+    # Authenticate with the managed identity of the compute
+    ml_client = MLClient(
+        ManagedIdentityCredential(client_id=os.getenv("DEFAULT_IDENTITY_CLIENT_ID")),
+        subscription_id=args.subscription_id,
+        resource_group_name=args.resource_group,
+        workspace_name=args.workspace_name,
+    )
+
+    # Read the registered model name and version
+    name, version = open(args.model_id_file).read().strip().split(":")
+    print(f"▶️  Deploying model {name}:{version}")
+    model = ml_client.models.get(name=name, version=version)
+
+    deploy(
+        ml_client,
+        model,
+        args.endpoint_name,
+        deployment_name=args.deployment_name,
+        code_dir=args.code_dir,
+        scoring_script=args.scoring_script,
+        instance_type=args.instance_type,
+        instance_count=args.instance_count,
+    )
 
 
 if __name__ == "__main__":
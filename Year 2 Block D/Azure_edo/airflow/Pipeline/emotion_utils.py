@@ -1,5 +1,8 @@
 # emotion_utils.py  (shared utility module)
 # ------------------------------------------------------------
+import numpy as np
+import pandas as pd
+
 core_emotions = [
     "admiration",
     "amusement",
@@ -33,3 +36,26 @@ core_emotions = [
 
 # trivial identity map (kept for completeness / future use)
 emotion_map = {e: e for e in core_emotions}
+
+
+def stratified_split(labels, test_size=0.2, seed=42):
+    """Stratified shuffle split of `labels` → (train_idx, test_idx) position arrays.
+
+    Same idea as sklearn's train_test_split(stratify=...), but done with one
+    shuffle + one stable sort instead of a pass per class. Every class with at
+    least 2 samples ends up in both splits.
+    """
+    codes, _ = pd.factorize(labels)
+    rng = np.random.default_rng(seed)
+
+    # shuffle, then stable-sort by class → rows grouped by class, random within a class
+    perm = rng.permutation(len(codes))
+    order = perm[np.argsort(codes[perm], kind="stable")]
+    sorted_codes = codes[order]
+
+    counts = np.bincount(codes)
+    starts = np.concatenate(([0], np.cumsum(counts)[:-1]))
+    n_test = np.clip(np.rint(counts * test_size), 1, np.maximum(counts - 1, 1)).astype(np.int64)
+    rank = np.arange(len(order)) - starts[sorted_codes]
+    is_test = rank < n_test[sorted_codes]
+    return order[~is_test], order[is_test]
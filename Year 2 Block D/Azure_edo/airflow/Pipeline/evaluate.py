@@ -7,14 +7,17 @@ Emits:
 """
 
 import argparse
+import hashlib
 import json
+import os
 import csv
 import time
 import psutil
-import gc
+import threading
 from pathlib import Path
 
 import numpy as np
+import pandas as pd
 import torch
 import mlflow
 from sklearn.metrics import (
@@ -24,70 +27,215 @@ from sklearn.metrics import (
     f1_score,
     classification_report,
 )
-from transformers import BertTokenizer, BertForSequenceClassification, Trainer
-from torch.utils.data import Dataset
+from transformers import (
+    BertTokenizerFast,
+    BertForSequenceClassification,
+    DataCollatorWithPadding,
+)
+from torch.utils.data import Dataset, DataLoader
 
 from emotion_utils import core_emotions
 
 
+# ── Tokenization cache ──────────────────────────────────────────────
+def tokenize_cached(texts, tokenizer, cache_dir=None):
+    """
+    Tokenize `texts` (no padding) and return {name: [one array per row]}.
+
+    With a cache_dir, the result is stored there as an .npz keyed by a hash of
+    the texts and the tokenizer vocab, so re-evaluating the same test set with
+    the same vocab (e.g. a new model from the same base) skips tokenization.
+    Rows are stored concatenated, with their lengths to split them again.
+    """
+    if not texts:
+        # empty test split: nothing to tokenize (or cache)
+        return {}
+
+    cache_path = None
+    if cache_dir:
+        h = hashlib.sha256(json.dumps(texts).encode())
+        h.update(json.dumps(sorted(tokenizer.get_vocab().items())).encode())
+        cache_path = Path(cache_dir, f"toks_{h.hexdigest()[:16]}.npz")
+        if cache_path.exists():
+            cached = np.load(cache_path)
+            splits = np.cumsum(cached["lengths"])[:-1]
+            return {
+                k: np.split(cached[k], splits) for k in cached.files if k != "lengths"
+            }
+
+    enc = tokenizer(texts, padding=False, truncation=True, max_length=128)
+    encodings = {k: [np.asarray(row, dtype=np.int64) for row in v] for k, v in enc.items()}
+
+    if cache_path is not None:
+        cache_path.parent.mkdir(parents=True, exist_ok=True)
+        lengths = np.array([len(row) for row in encodings["input_ids"]], dtype=np.int64)
+        flat = {k: np.concatenate(v) for k, v in encodings.items()}
+        np.savez_compressed(cache_path, lengths=lengths, **flat)
+    return encodings
+
+
 # ── Dataset ─────────────────────────────────────────────────────────
 class EmotionDataset(Dataset):
-    def __init__(self, texts, labels, tokenizer):
+    def __init__(self, texts, labels, tokenizer, cache_dir=None):
         texts = texts.tolist() if hasattr(texts, "tolist") else list(texts)
-        enc = tokenizer(texts, padding=True, truncation=True, max_length=128)
-        self.encodings = enc
+        # no padding here: DataCollatorWithPadding pads each batch to its own longest text
+        enc = tokenize_cached(texts, tokenizer, cache_dir)
+        # convert every row to tensors once, so __getitem__ is just a lookup
+        self.encodings = {k: [torch.from_numpy(row) for row in v] for k, v in enc.items()}
 
         # build a clear mapping from emotion name to ID
         mapping = {e: i for i, e in enumerate(core_emotions)}
         # use a descriptive loop variable instead of the ambiguous 'l'
-        self.labels = [mapping[label] for label in labels]
+        self.labels = torch.from_numpy(
+            np.fromiter((mapping[label] for label in labels), dtype=np.int64, count=len(labels))
+        )
 
     def __len__(self):
         return len(self.labels)
 
     def __getitem__(self, idx):
-        item = {}
-        for k, v in self.encodings.items():
-            item[k] = torch.tensor(v[idx])
-        item["labels"] = torch.tensor(self.labels[idx])
+        item = {k: v[idx] for k, v in self.encodings.items()}
+        item["labels"] = self.labels[idx]
         return item
 
 
 # Create emotion2id mapping for consistency
 emotion2id = {e: i for i, e in enumerate(core_emotions)}
 
+# bf16 needs an Ampere (or newer) GPU; older GPUs fall back to fp16 autocast
+USE_BF16 = torch.cuda.is_available() and torch.cuda.is_bf16_supported()
+
+
+class PeakSampler:
+    """
+    Samples CPU usage and this process's RSS every `interval` seconds in a
+    background thread and keeps the peaks, so the stats cover the whole
+    prediction instead of a single snapshot taken afterwards.
+    """
+
+    def __init__(self, interval=0.5):
+        self.interval = interval
+        self.peak_cpu = 0.0
+        self.peak_rss = 0
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+
+    def _run(self):
+        proc = psutil.Process()
+        while True:
+            # cpu_percent blocks for `interval` and measures usage over it
+            self.peak_cpu = max(self.peak_cpu, psutil.cpu_percent(interval=self.interval))
+            self.peak_rss = max(self.peak_rss, proc.memory_info().rss)
+            if self._stop.is_set():
+                break
+
+    def __enter__(self):
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self._stop.set()
+        self._thread.join()
+
+
+def predict(model, ds, tokenizer, batch_size=64):
+    """
+    Run the model over the dataset. Returns the predicted class ids and the
+    latency (seconds) of the forward pass of the first batch (NaN for an empty
+    dataset).
+    """
+    device = torch.device("cuda" if torch.cuda.is_available() else "cpu")
+    model.eval().to(device)
+    loader = DataLoader(
+        ds,
+        batch_size=batch_size,
+        collate_fn=DataCollatorWithPadding(tokenizer),
+        pin_memory=device.type == "cuda",
+        num_workers=2,
+    )
+
+    preds = []
+    latency = float("nan")
+    # autocast only applies on the GPU; on CPU this is a plain fp32 forward
+    amp_dtype = torch.bfloat16 if USE_BF16 else torch.float16
+    with torch.inference_mode(), torch.autocast(
+        device.type, dtype=amp_dtype, enabled=device.type == "cuda"
+    ):
+        for i, batch in enumerate(loader):
+            batch = {k: v.to(device, non_blocking=True) for k, v in batch.items() if k != "labels"}
+            if i == 0:
+                # time the first forward pass instead of running a separate one
+                logits, latency = _timed_forward(model, batch, device)
+            else:
+                logits = model(**batch).logits
+            # only the argmax leaves the GPU, as int16 (28 classes)
+            preds.append(logits.argmax(-1).to(torch.int16).cpu().numpy())
+    if not preds:
+        return np.empty(0, dtype=np.int16), latency
+    return np.concatenate(preds), latency
+
+
+def _timed_forward(model, batch, device):
+    """Forward pass that also returns its duration in seconds."""
+    if device.type == "cuda":
+        # CUDA events time the kernels themselves, not just the async launch
+        start, end = torch.cuda.Event(enable_timing=True), torch.cuda.Event(enable_timing=True)
+        start.record()
+        logits = model(**batch).logits
+        end.record()
+        torch.cuda.synchronize()
+        return logits, start.elapsed_time(end) / 1000
+    start = time.perf_counter()
+    logits = model(**batch).logits
+    return logits, time.perf_counter() - start
+
 
 def main():
     ap = argparse.ArgumentParser()
     ap.add_argument("--model_dir", required=True)
-    ap.add_argument("--test_texts", required=True)
-    ap.add_argument("--test_labels", required=True)
+    ap.add_argument(
+        "--data_dir", required=True, help="Folder with test.parquet from preprocessing"
+    )
     ap.add_argument("--output_metrics", required=True)
     ap.add_argument("--max_rows", type=int, default=0)
+    ap.add_argument(
+        "--token_cache_dir",
+        default=os.environ.get("AZUREML_DATACACHE", "/tmp"),
+        help="Where tokenized test sets are cached across runs ('' to disable)",
+    )
     args = ap.parse_args()
 
     # load test data
-    with open(args.test_texts) as f:
-        texts = f.read().splitlines()
-    with open(args.test_labels) as f:
-        labels = f.read().splitlines()
+    test_df = pd.read_parquet(Path(args.data_dir, "test.parquet"))
+    texts = test_df["text"].astype(str).tolist()
+    labels = test_df["label"].tolist()
     if args.max_rows > 0:
         texts, labels = texts[: args.max_rows], labels[: args.max_rows]
+    # the sklearn metrics below can't be computed on an empty split
+    if not texts:
+        raise RuntimeError(
+            f"No test samples in {Path(args.data_dir, 'test.parquet')}; nothing to evaluate."
+        )
 
     # load model & tokenizer
-    tokenizer = BertTokenizer.from_pretrained(args.model_dir)
-    model = BertForSequenceClassification.from_pretrained(args.model_dir)
+    tokenizer = BertTokenizerFast.from_pretrained(args.model_dir)
+    # SDPA picks the fused (flash / memory-efficient) attention kernels when available
+    model = BertForSequenceClassification.from_pretrained(
+        args.model_dir,
+        torch_dtype=torch.bfloat16 if USE_BF16 else None,
+        attn_implementation="sdpa",
+    )
 
-    ds = EmotionDataset(texts, labels, tokenizer)
-    trainer = Trainer(model=model)
-    preds = trainer.predict(ds)
-    y_pred = np.argmax(preds.predictions, axis=1)
-    y_true = preds.label_ids
+    ds = EmotionDataset(texts, labels, tokenizer, cache_dir=args.token_cache_dir)
+    with PeakSampler() as sampler:
+        y_pred, latency = predict(model, ds, tokenizer)
+    y_true = ds.labels.numpy()
 
     # ── map predictions to emotion names
     raw_id2label = getattr(model.config, "id2label", {})
     id2label = {int(k): v for k, v in raw_id2label.items()}
-    pred_names = [id2label[p] for p in y_pred]
+    id2label_arr = np.array([id2label[i] for i in range(len(id2label))])
+    pred_names = id2label_arr[y_pred].tolist()
 
     acc = accuracy_score(y_true, y_pred)
     macro_f1 = f1_score(y_true, y_pred, average="macro", zero_division=0)
@@ -126,30 +274,19 @@ def main():
     mlflow.log_metric("prediction_std", pred_std)
 
     # ── count predictions per class
-    unique, counts = np.unique(y_pred, return_counts=True)
-    for lbl, cnt in zip(unique, counts):
+    counts = np.bincount(y_pred, minlength=len(core_emotions))
+    for lbl, cnt in enumerate(counts):
         mlflow.log_metric(f"pred_count_{lbl}", int(cnt))
 
-    # ── latency measurement (on a small batch to save memory)
-    small_batch_texts = texts[:8] if len(texts) > 8 else texts
-    start = time.time()
-    batch_inputs = tokenizer(
-        list(small_batch_texts),
-        padding=True,
-        truncation=True,
-        max_length=128,
-        return_tensors="pt",
-    )
-    batch_inputs = {k: v.to(model.device) for k, v in batch_inputs.items()}
-    _ = model(**batch_inputs)
-    latency = time.time() - start
-    mlflow.log_metric("prediction_latency", latency)
+    # ── latency of the first (cold, batch_size 64) prediction batch; logged under
+    # its own name, it isn't comparable with the old warm 8-text prediction_latency
+    mlflow.log_metric("first_batch_latency", latency)
 
-    # ── system stats
-    cpu_usage = psutil.cpu_percent()
-    memory_usage = psutil.virtual_memory().percent
-    mlflow.log_metric("cpu_usage", cpu_usage)
-    mlflow.log_metric("memory_usage", memory_usage)
+    # ── system stats (peaks sampled during prediction)
+    peak_cpu_usage = sampler.peak_cpu
+    peak_memory_mb = sampler.peak_rss / 2**20
+    mlflow.log_metric("peak_cpu_usage", peak_cpu_usage)
+    mlflow.log_metric("peak_memory_mb", peak_memory_mb)
 
     # ── prepare metrics for output
     metrics = {
@@ -160,9 +297,9 @@ def main():
         "f1_score": macro_f1,
         "prediction_mean": pred_mean,
         "prediction_std": pred_std,
-        "prediction_latency": latency,
-        "cpu_usage": cpu_usage,
-        "memory_usage": memory_usage,
+        "first_batch_latency": latency,
+        "peak_cpu_usage": peak_cpu_usage,
+        "peak_memory_mb": peak_memory_mb,
     }
 
     # Add per-class f1 scores
@@ -171,7 +308,7 @@ def main():
             metrics[f"{emo}_f1"] = report[emo]["f1-score"]
 
     # Add prediction counts
-    for lbl, cnt in zip(unique, counts):
+    for lbl, cnt in enumerate(counts):
         metrics[f"pred_count_{lbl}"] = int(cnt)
 
     # ── inject the string predictions into the report for full JSON output
@@ -194,13 +331,6 @@ def main():
 
     print(json.dumps(metrics, indent=2))
 
-    # ── cleanup to reduce memory
-    del trainer
-    del ds
-    del preds
-    del model
-    gc.collect()
-
 
 if __name__ == "__main__":
     main()
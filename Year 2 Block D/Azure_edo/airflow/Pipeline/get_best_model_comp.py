@@ -8,12 +8,15 @@ best_f1        : text file with the champion’s F1
 """
 
 import argparse
+import errno
 import os
 import shutil
 from pathlib import Path
-from azure.identity import DefaultAzureCredential
+from azure.identity import ManagedIdentityCredential
 from azure.ai.ml import MLClient
 
+from champion import find_champion
+
 
 def main() -> None:
     ap = argparse.ArgumentParser()
@@ -22,22 +25,17 @@ def main() -> None:
     ap.add_argument("--best_f1", required=True)
     args = ap.parse_args()
 
+    # managed identity of the compute (DEFAULT_IDENTITY_CLIENT_ID is set by
+    # Azure ML for a user-assigned identity, None picks the system-assigned one)
     ml = MLClient(
-        DefaultAzureCredential(),
+        ManagedIdentityCredential(client_id=os.getenv("DEFAULT_IDENTITY_CLIENT_ID")),
         subscription_id=os.environ["AZUREML_ARM_SUBSCRIPTION"],
         resource_group_name=os.environ["AZUREML_ARM_RESOURCEGROUP"],
         workspace_name=os.environ["AZUREML_ARM_WORKSPACE_NAME"],
     )
 
-    # ── find champion by f1 tag ──────────────────────────────────
-    best_f1, best_pair = 0.0, None
-    for m in ml.models.list(name=args.model_name):
-        try:
-            f1 = float(m.tags.get("f1", 0.0))
-        except (ValueError, TypeError):
-            f1 = 0.0
-        if f1 > best_f1:
-            best_f1, best_pair = f1, (m.name, m.version)
+    # ── find champion (latest version if tagged, else by f1 tag) ─
+    best_f1, best_pair = find_champion(ml, args.model_name)
 
     out_dir = Path(args.best_model_dir)
     out_dir.mkdir(parents=True, exist_ok=True)
@@ -56,11 +54,21 @@ def main() -> None:
         base = configs[0].parent
         if base != out_dir:
             for item in base.iterdir():
-                shutil.move(str(item), out_dir / item.name)
-            # remove empty subdirs
-            for sub in out_dir.iterdir():
-                if sub.is_dir() and not any(sub.iterdir()):
-                    shutil.rmtree(sub)
+                try:
+                    # same filesystem → a single rename, no copy
+                    os.replace(item, out_dir / item.name)
+                except OSError as e:
+                    if e.errno != errno.EXDEV:
+                        raise
+                    shutil.move(str(item), out_dir / item.name)
+            # remove the now empty nested folders (base and its parents)
+            d = base
+            while d != out_dir:
+                try:
+                    d.rmdir()
+                except OSError:
+                    break  # not empty (other artifacts live there), keep it
+                d = d.parent
     else:
         print("🔍 No champion model found (cold start)")
         (out_dir / "_placeholder.txt").write_text("no model yet")
@@ -1,6 +1,6 @@
 #!/usr/bin/env python3
 """
-Prepares train/test CSV shards for the emotion pipeline.
+Prepares the train/test split for the emotion pipeline.
 
 Steps
 -----
@@ -8,44 +8,47 @@ Steps
 2. Map raw labels to your core-emotion set (drops unmapped).
 3. Drop any core emotion class with ≤1 example.
 4. Stratified 80/20 split.
-5. Write four flat CSVs (no header, no index).
+5. Write train.parquet and test.parquet (`text`, `label`) to one output folder.
 """
 
 import argparse
 import os
 import sys
 
+import numpy as np
 import pandas as pd
-from sklearn.model_selection import train_test_split
+import pyarrow as pa
+import pyarrow.csv as pv
 
 from emotion_utils import emotion_map  # your mapping dict: raw→core
+from emotion_utils import stratified_split
 
 
-def write_series(series: pd.Series, out_path: str) -> None:
+def write_split(texts: pd.Series, labels: pd.Series, out_path: str) -> None:
     os.makedirs(os.path.dirname(out_path), exist_ok=True)
-    series.to_csv(out_path, index=False, header=False)
+    pd.DataFrame({"text": texts, "label": labels}).to_parquet(out_path, index=False)
 
 
 def main() -> None:
     p = argparse.ArgumentParser()
     p.add_argument("--input_path", required=True)
-    p.add_argument("--train_texts_out", required=True)
-    p.add_argument("--train_labels_out", required=True)
-    p.add_argument("--test_texts_out", required=True)
-    p.add_argument("--test_labels_out", required=True)
+    p.add_argument("--output_dir", required=True)
     args = p.parse_args()
 
     # ── load raw CSV ────────────────────────────────────────────────
-    df = pd.read_csv(args.input_path)
-    cols = set(df.columns)
-
-    # Ensure required columns are present
-    if "translation" not in cols or "emotion" not in cols:
+    # Arrow's multithreaded reader, parsing only the two columns we use
+    try:
+        table = pv.read_csv(
+            args.input_path,
+            convert_options=pv.ConvertOptions(include_columns=["translation", "emotion"]),
+        )
+    except pa.ArrowKeyError as e:
+        # Ensure required columns are present
         sys.stderr.write(
-            f"ERROR: input CSV must have 'translation' and 'emotion' columns.\n"
-            f"Found: {sorted(cols)}\n"
+            f"ERROR: input CSV must have 'translation' and 'emotion' columns.\n{e}\n"
         )
         sys.exit(1)
+    df = table.to_pandas()
 
     # ── pick your features and labels ───────────────────────────────
     df = df[["translation", "emotion"]].rename(
@@ -53,34 +56,36 @@ def main() -> None:
     )
 
     # ── map raw labels → core emotions ─────────────────────────────
-    df["core"] = df["raw_label"].map(emotion_map)
-    df = df.dropna(subset=["core"]).reset_index(drop=True)
+    # Map the (few) distinct raw labels once and gather the result through the
+    # category codes, instead of a dict lookup per row
+    raw = pd.Categorical(df["raw_label"])
+    mapped = pd.Series(raw.categories).map(emotion_map)
+    core_cats = pd.Index(mapped.dropna().unique())
+    lut = np.append(core_cats.get_indexer(mapped), -1)  # unmapped/NaN → -1
+    codes = lut[raw.codes]
+    df["core"] = pd.Categorical.from_codes(codes, categories=core_cats)
+    df = df[codes >= 0].reset_index(drop=True)
     if df.empty:
         raise RuntimeError("No samples remain after mapping to core emotions.")
 
     # ── drop singleton classes (≤1 sample) ──────────────────────────
-    counts = df["core"].value_counts()
-    keep = counts.index
-    before, after = len(counts), len(keep)
-    if after < before:
-        dropped = set(counts.index) - set(keep)
+    codes = df["core"].cat.codes.to_numpy()
+    counts = np.bincount(codes, minlength=len(df["core"].cat.categories))
+    singleton = counts == 1
+    if singleton.any():
+        dropped = df["core"].cat.categories[singleton]
         print(f"🗑️  Dropping singleton classes: {sorted(dropped)}")
-    df = df[df["core"].isin(keep)].reset_index(drop=True)
+        df = df[~singleton[codes]].reset_index(drop=True)
 
     # ── stratified 80/20 split ────────────────────────────────────
-    X_train, X_test, y_train, y_test = train_test_split(
-        df["text"],
-        df["core"],
-        test_size=0.20,
-        random_state=42,
-        stratify=df["core"],
-    )
-
-    # ── persist outputs ────────────────────────────────────────────
-    write_series(X_train, args.train_texts_out)
-    write_series(y_train, args.train_labels_out)
-    write_series(X_test, args.test_texts_out)
-    write_series(y_test, args.test_labels_out)
+    df["core"] = df["core"].cat.remove_unused_categories()
+    train_idx, test_idx = stratified_split(df["core"], test_size=0.20, seed=42)
+    X_train, y_train = df["text"].take(train_idx), df["core"].take(train_idx)
+    X_test, y_test = df["text"].take(test_idx), df["core"].take(test_idx)
+
+    # ── persist outputs (one folder instead of four separate files) ─
+    write_split(X_train, y_train, os.path.join(args.output_dir, "train.parquet"))
+    write_split(X_test, y_test, os.path.join(args.output_dir, "test.parquet"))
 
     print(
         "✅ Preprocessing finished:",
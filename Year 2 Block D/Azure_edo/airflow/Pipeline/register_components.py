@@ -1,6 +1,9 @@
 # register_components.py  ── SDK-only, YAML round-trip
 
+import hashlib
+import json
 import tempfile
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from azure.identity import DefaultAzureCredential
 from azure.ai.ml import MLClient
@@ -10,8 +13,12 @@ SUB_ID = "0a94de80-6d3b-49f2-b3e9-ec5818862801"
 RGROUP = "buas-y2"
 WS_NAME = "NLP1-2025"
 
+# name:version → sha256 of the YAML and code registered last time; unchanged ones are skipped
+HASH_CACHE = Path(__file__).with_name(".component_hashes.json")
+
+credential = DefaultAzureCredential()
 ml = MLClient(
-    DefaultAzureCredential(),
+    credential,
     subscription_id=SUB_ID,
     resource_group_name=RGROUP,
     workspace_name=WS_NAME,
@@ -24,16 +31,65 @@ factories = [
     component.evaluate_comp,
     component.visualize_comp,
     component.register_comp,
-    component.deploy_comp,
 ]
 
+
+
+def code_digest(code_dir):
+    """sha256 over the relative path and contents of every file in a component's code folder."""
+    root = Path(code_dir)
+    h = hashlib.sha256()
+    for path in sorted(p for p in root.rglob("*") if p.is_file()):
+        rel = path.relative_to(root)
+        # the hash cache itself and bytecode change without the code changing
+        if rel.name == HASH_CACHE.name or "__pycache__" in rel.parts:
+            continue
+        h.update(rel.as_posix().encode() + b"\0")
+        h.update(path.read_bytes())
+    return h.hexdigest()
+
+
 tmpdir = Path(tempfile.mkdtemp(prefix="comp_yaml_"))
 print(f"✍️  Exporting YAMLs to {tmpdir}")
 
+cache = json.loads(HASH_CACHE.read_text()) if HASH_CACHE.is_file() else {}
+# the factories share their code folder (code="."), so hash each folder once
+code_digests = {}
+pending = []
 for fac in factories:
+    key = f"{fac.name}:{fac.version}"
     yaml_path = tmpdir / f"{fac.name}_v{fac.version}.yaml"
     fac.save(str(yaml_path))  # ① write YAML
+    # the YAML only references the code folder, so its contents are hashed too:
+    # editing train.py etc. without a version bump still re-registers
+    code_dir = str(fac.code)
+    if code_dir not in code_digests:
+        code_digests[code_dir] = code_digest(code_dir)
+    digest = hashlib.sha256(
+        yaml_path.read_bytes() + code_digests[code_dir].encode()
+    ).hexdigest()
+    if cache.get(key) == digest:
+        print(f"⏭  {key} unchanged, skipping")
+        continue
+    pending.append((key, digest, yaml_path))
+
+
+def register(item):
+    key, digest, yaml_path = item
     created = ml.components.create_or_update(str(yaml_path))  # ② register
     print(f"✔ Registered {created.name}:{created.version}")
+    return key, digest
+
+
+if pending:
+    # fetch the ARM token once up front, so the parallel registrations
+    # don't all hit the token endpoint at the same time
+    credential.get_token("https://management.azure.com/.default")
+    try:
+        with ThreadPoolExecutor(max_workers=len(pending)) as ex:
+            for key, digest in ex.map(register, pending):
+                cache[key] = digest
+    finally:
+        HASH_CACHE.write_text(json.dumps(cache, indent=2))
 
 print("🏁 All components registered successfully.")
@@ -2,8 +2,12 @@
 import argparse
 import json
 import os
-from azure.identity import DefaultAzureCredential
+from azure.identity import ManagedIdentityCredential
 from azure.ai.ml import MLClient
+from azure.ai.ml.entities import Model
+
+from champion import CHAMPION_TAG, find_champion
+from deploy_model import deploy
 
 
 def main():
@@ -12,6 +16,13 @@ def main():
     p.add_argument("--model_name", required=True)
     p.add_argument("--metrics_json", required=True)
     p.add_argument("--registered_model", required=True)
+    # deployment (optional): deploy the champion right after registering it
+    p.add_argument("--endpoint_name", default=None)
+    p.add_argument("--deployment_name", default="green")
+    p.add_argument("--code_dir", default="./src")
+    p.add_argument("--scoring_script", default="score.py")
+    p.add_argument("--instance_type", default="gpu")
+    p.add_argument("--instance_count", type=int, default=1)
     args = p.parse_args()
 
     # Load challenger metrics
@@ -21,7 +32,8 @@ def main():
     challenger_f1 = m.get("macro_avg_f1", m.get("f1", 0.0))
 
     # Authenticate and look up current champion
-    cred = DefaultAzureCredential()
+    # (managed identity of the compute, see get_best_model_comp.py)
+    cred = ManagedIdentityCredential(client_id=os.getenv("DEFAULT_IDENTITY_CLIENT_ID"))
     ml = MLClient(
         cred,
         os.environ["AZUREML_ARM_SUBSCRIPTION"],
@@ -30,35 +42,49 @@ def main():
     )
 
     # Get best existing F1 tag
-    best_f1, best_pair = 0.0, None
-    for model in ml.models.list(name=args.model_name):
-        try:
-            f1 = float(model.tags.get("f1", 0.0))
-        except (ValueError, TypeError):
-            f1 = 0.0
-        if f1 > best_f1:
-            best_f1, best_pair = f1, (model.name, model.version)
+    best_f1, best_pair = find_champion(ml, args.model_name)
 
     # Compare and decide
     if challenger_f1 > best_f1:
         # register new champion
         print(f"🏆 Challenger wins ({challenger_f1:.4f} > {best_f1:.4f}) → registering")
         new_model = ml.models.create_or_update(
-            name=args.model_name,
-            path=args.model_dir,
-            description=f"Auto-registered model with F1={challenger_f1:.4f}",
-            tags={"f1": f"{challenger_f1:.4f}"},
+            Model(
+                name=args.model_name,
+                path=args.model_dir,
+                description=f"Auto-registered model with F1={challenger_f1:.4f}",
+                # the champion tag lets find_champion stop at the latest version
+                tags={"f1": f"{challenger_f1:.4f}", CHAMPION_TAG: "true"},
+            )
         )
+        champion = new_model
         registered = f"{new_model.name}:{new_model.version}"
     else:
         # keep existing
         print(f"🤷 Challenger loses → keeping champion {best_pair[0]}:{best_pair[1]}")
+        champion = None
         registered = f"{best_pair[0]}:{best_pair[1]}"
 
     # Write out the name:version for downstream
     with open(args.registered_model, "w") as out:
         out.write(registered)
 
+    # Deploy the champion in the same process (reusing the client and, for a
+    # new champion, the Model returned by the registration)
+    if args.endpoint_name:
+        if champion is None:
+            champion = ml.models.get(name=best_pair[0], version=best_pair[1])
+        deploy(
+            ml,
+            champion,
+            args.endpoint_name,
+            deployment_name=args.deployment_name,
+            code_dir=args.code_dir,
+            scoring_script=args.scoring_script,
+            instance_type=args.instance_type,
+            instance_count=args.instance_count,
+        )
+
 
 if __name__ == "__main__":
     main()
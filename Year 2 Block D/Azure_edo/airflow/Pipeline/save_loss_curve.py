@@ -1,26 +1,31 @@
 import base64
+import sys
 from io import BytesIO
+from pathlib import Path
 from PIL import Image
 
 
 # Step 1: Path to the base64-encoded output file (update if needed)
 b64_path = "loss_curve_b64.txt"  # or the path Azure saved (e.g. downloaded manually)
 output_png = "loss_curve.png"
+verify = "--verify" in sys.argv[1:]
 
 # Step 2: Read and decode the base64 image
-with open(b64_path, "r") as f:
-    b64_string = f.read()
+with open(b64_path, "rb") as f:
+    b64_bytes = f.read()
 
-img_data = base64.b64decode(b64_string)
-image = Image.open(BytesIO(img_data))
+img_data = base64.b64decode(b64_bytes)
+if verify:
+    # integrity check only, without decoding the pixel data
+    Image.open(BytesIO(img_data)).verify()
 
-# Step 3: Save to PNG
-image.save(output_png)
+# Step 3: Save to PNG (the payload already is a PNG, so no decode/re-encode)
+Path(output_png).write_bytes(img_data)
 print(f"✅ Loss curve saved as {output_png}")
 
 # Step 4: Optional — show image
 try:
-    image.show()
+    Image.open(output_png).show()
 except OSError:
     # viewer/display not available in this environment
     print("Image saved, but preview not supported in this environment.")
@@ -2,6 +2,7 @@
 import os
 import json
 import logging
+import numpy as np
 import torch
 
 from transformers import AutoTokenizer, AutoModelForSequenceClassification
@@ -9,7 +10,14 @@ from transformers import AutoTokenizer, AutoModelForSequenceClassification
 logger = logging.getLogger("score")
 logging.basicConfig(level=logging.INFO)
 
-tokenizer = model = device = None
+tokenizer = model = device = id2label_arr = None
+
+# texts per forward pass; requests are split into batches of this size
+BATCH_SIZE = 32
+
+# int8 dynamic quantization on CPU is opt-in: the registered (fp32) model is the
+# one whose F1 was evaluated, and the quantized one can predict differently
+QUANTIZE_INT8 = os.getenv("SCORE_QUANTIZE_INT8", "0") == "1"
 
 
 def _find_model_subfolder(root_dir):
@@ -23,8 +31,21 @@ def _find_model_subfolder(root_dir):
     raise FileNotFoundError(f"config.json not found under {root_dir}")
 
 
+def _warmup():
+    # torch.compile compiles on the first call (and again for shapes it has not
+    # specialised yet), so run a few dummy batches here instead of inside the
+    # first scoring requests: a full batch of short and of long texts, and a single
+    # text. The inputs are built under inference_mode exactly like in run(), otherwise
+    # the compiled graph's guards don't match the request tensors
+    with torch.inference_mode():
+        for texts in (["warm up"] * BATCH_SIZE, ["warm up " * 64] * BATCH_SIZE, ["warm up"]):
+            enc = tokenizer(texts, padding=True, truncation=True, return_tensors="pt")
+            enc = {k: v.to(device, non_blocking=True) for k, v in enc.items()}
+            model(**enc)
+
+
 def init():
-    global tokenizer, model, device
+    global tokenizer, model, device, id2label_arr
     device = torch.device("cuda" if torch.cuda.is_available() else "cpu")
     root = os.getenv("AZUREML_MODEL_DIR")
     model_dir = _find_model_subfolder(root)
@@ -35,6 +56,25 @@ def init():
     )
     model.to(device).eval()
 
+    # class id → emotion name lookup table, so mapping predictions is one gather
+    id2label = {int(k): v for k, v in getattr(model.config, "id2label", {}).items()}
+    id2label_arr = np.array(
+        [id2label.get(i, str(i)) for i in range(model.config.num_labels)], dtype=object
+    )
+
+    if device.type == "cuda":
+        # fused kernels; request shapes vary, so compile for dynamic shapes
+        # rather than "reduce-overhead" (CUDA graphs would re-record per shape)
+        model = torch.compile(model, dynamic=True)
+        _warmup()
+    elif QUANTIZE_INT8:
+        # CPU deployments with SCORE_QUANTIZE_INT8=1: int8 dynamic quantization
+        # of the Linear layers
+        logger.info("Serving an int8 dynamically quantized model")
+        model = torch.ao.quantization.quantize_dynamic(
+            model, {torch.nn.Linear}, dtype=torch.qint8
+        )
+
 
 def run(raw_request: str):
     try:
@@ -48,15 +88,22 @@ def run(raw_request: str):
     if not isinstance(texts, (list, tuple)):
         return json.dumps({"error": "text must be string or list", "code": 400})
 
-    enc = tokenizer(texts, padding=True, truncation=True, return_tensors="pt")
-    enc = {k: v.to(device) for k, v in enc.items()}
-    with torch.no_grad():
-        logits = model(**enc).logits
+    # Sort by length so every batch pads to (roughly) its own longest text
+    order = np.argsort([len(t) for t in texts], kind="stable")
+    preds = []
+    with torch.inference_mode():
+        for start in range(0, len(order), BATCH_SIZE):
+            batch = [texts[i] for i in order[start : start + BATCH_SIZE]]
+            enc = tokenizer(batch, padding=True, truncation=True, return_tensors="pt")
+            enc = {k: v.to(device, non_blocking=True) for k, v in enc.items()}
+            preds.append(torch.argmax(model(**enc).logits, dim=-1))
 
-    preds = torch.argmax(logits, dim=-1).cpu().tolist()
+    # one device→host copy for the whole request, then undo the length sort
+    sorted_preds = torch.cat(preds).cpu().numpy() if preds else np.empty(0, dtype=np.int64)
+    pred_ids = np.empty_like(sorted_preds)
+    pred_ids[order] = sorted_preds
 
     # Map directly to emotion names
-    id2label = getattr(model.config, "id2label", {})
-    emotions = [id2label.get(str(i), str(i)) for i in preds]
+    emotions = id2label_arr[pred_ids].tolist()
 
     return json.dumps({"predictions": emotions})
@@ -9,6 +9,7 @@ and doing a learning-rate sweep. Emits:
 
 import argparse
 import ast
+import copy
 import json
 import os
 import shutil
@@ -16,18 +17,24 @@ from pathlib import Path
 
 import pandas as pd
 import torch
+import torch.nn.functional as F
 from torch.utils.data import Dataset
 from transformers import (
     BertForSequenceClassification,
-    BertTokenizer,
+    BertTokenizerFast,
+    EarlyStoppingCallback,
+    TrainerCallback,
     TrainingArguments,
     Trainer,
 )
-from sklearn.model_selection import train_test_split
 from sklearn.metrics import f1_score
 
 from emotion_utils import emotion_map
 from emotion_utils import core_emotions
+from emotion_utils import stratified_split
+
+# let the Rust tokenizer spread a batch over all cores
+os.environ.setdefault("TOKENIZERS_PARALLELISM", "true")
 
 
 # ── Helpers ─────────────────────────────────────────────────────────
@@ -46,28 +53,90 @@ def first_label(cell):
 emotion2id = {e: i for i, e in enumerate(core_emotions)}
 id2emotion = {i: e for e, i in emotion2id.items()}
 
+# bf16 mixed precision (and TF32 matmuls) need an Ampere (or newer) GPU
+USE_BF16 = torch.cuda.is_available() and torch.cuda.is_bf16_supported()
+
+# texts per tokenizer call; bounds the Rust-side allocations on large datasets
+TOKENIZE_CHUNK = 10_000
+
 
 class EmotionDataset(Dataset):
     def __init__(self, texts, labels, tokenizer):
         texts = texts.tolist() if hasattr(texts, "tolist") else list(texts)
-        enc = tokenizer(texts, padding=True, truncation=True, max_length=128)
-        self.encodings = enc
-        self.labels = [emotion2id[label] for label in labels]
+        # tokenize once into [N, seq_len] tensors; __getitem__ just returns row views
+        encs = [
+            tokenizer(
+                texts[i : i + TOKENIZE_CHUNK],
+                padding=True,
+                truncation=True,
+                max_length=128,
+                return_tensors="pt",
+            )
+            for i in range(0, len(texts), TOKENIZE_CHUNK)
+        ]
+        # every chunk is padded to its own longest text; right-pad to the overall one
+        seq_len = max(enc["input_ids"].shape[1] for enc in encs)
+        pad_values = {"input_ids": tokenizer.pad_token_id}
+        self.encodings = {
+            k: torch.cat(
+                [
+                    F.pad(enc[k], (0, seq_len - enc[k].shape[1]), value=pad_values.get(k, 0))
+                    for enc in encs
+                ]
+            )
+            for k in encs[0].keys()
+        }
+        # one vectorized lookup of the class ids instead of a dict hit per row
+        codes = pd.Categorical(labels, categories=core_emotions).codes
+        if (codes < 0).any():
+            unknown = sorted(set(pd.Series(labels)[codes < 0]))
+            raise KeyError(f"Unknown emotion labels: {unknown}")
+        self.labels = torch.tensor(codes, dtype=torch.long)
 
     def __len__(self):
         return len(self.labels)
 
     def __getitem__(self, idx):
-        item = {k: torch.tensor(v[idx]) for k, v in self.encodings.items()}
-        item["labels"] = torch.tensor(self.labels[idx])
+        item = {k: v[idx] for k, v in self.encodings.items()}
+        item["labels"] = self.labels[idx]
         return item
 
 
+class SweepPruner(TrainerCallback):
+    """Stop a sweep run early once its eval_loss is clearly worse than the best run so far."""
+
+    def __init__(self, best_loss, factor=1.2):
+        self.best_loss = best_loss
+        self.factor = factor
+
+    def on_evaluate(self, args, state, control, metrics=None, **kwargs):
+        if metrics and metrics.get("eval_loss", 0.0) > self.factor * self.best_loss:
+            print(f"✂️  Pruning: eval_loss {metrics['eval_loss']:.4f} > {self.factor}× best")
+            control.should_training_stop = True
+
+
+class LogCollector(TrainerCallback):
+    """Collect a sweep run's logs (tagged with its lr) and its best eval_loss as they come in."""
+
+    def __init__(self, lr, all_logs):
+        self.lr = lr
+        self.all_logs = all_logs
+        self.best_eval_loss = float("inf")
+
+    def on_log(self, args, state, control, logs=None, **kwargs):
+        if not logs:
+            return
+        self.all_logs.append({**logs, "step": state.global_step, "lr": self.lr})
+        if "eval_loss" in logs:
+            self.best_eval_loss = min(self.best_eval_loss, logs["eval_loss"])
+
+
 # ── Main ────────────────────────────────────────────────────────────
 def main():
     ap = argparse.ArgumentParser()
-    ap.add_argument("--train_texts", required=True)
-    ap.add_argument("--train_labels", required=True)
+    ap.add_argument(
+        "--data_dir", required=True, help="Folder with train.parquet from preprocessing"
+    )
     ap.add_argument("--output_dir", default="./outputs/model")
     ap.add_argument("--log_history", default="./outputs/log_history.json")
     ap.add_argument(
@@ -85,20 +154,24 @@ def main():
         print("❄️ Cold start from bert-base-uncased")
 
     # Load & filter data
-    raw_texts = pd.read_csv(args.train_texts, header=None)[0].astype(str)
-    raw_labels = pd.read_csv(args.train_labels, header=None)[0].map(first_label)
+    train_df = pd.read_parquet(Path(args.data_dir, "train.parquet"))
+    raw_texts = train_df["text"].astype(str)
+    raw_labels = train_df["label"]
+    # preprocessing writes plain labels; only parse list-encoded cells if there are any
+    if raw_labels.astype(str).str.lstrip().str.startswith("[").any():
+        raw_labels = raw_labels.map(first_label)
     df = pd.DataFrame(
         {"text": raw_texts, "label": raw_labels.map(emotion_map)}
     ).dropna()
     vc = df["label"].value_counts()
-    df = df[df["label"].map(vc) > 1].reset_index(drop=True)
+    df = df[df["label"].isin(vc.index[vc > 1])].reset_index(drop=True)
     texts, labels = df["text"], df["label"].str.lower()
-    tr_texts, val_texts, tr_labels, val_labels = train_test_split(
-        texts, labels, test_size=0.2, random_state=42, stratify=labels
-    )
+    tr_idx, val_idx = stratified_split(labels, test_size=0.2, seed=42)
+    tr_texts, val_texts = texts.take(tr_idx), texts.take(val_idx)
+    tr_labels, val_labels = labels.take(tr_idx), labels.take(val_idx)
 
     # Tokenizer & datasets
-    tokenizer = BertTokenizer.from_pretrained("bert-base-uncased")
+    tokenizer = BertTokenizerFast.from_pretrained("bert-base-uncased")
     train_ds = EmotionDataset(tr_texts, tr_labels, tokenizer)
     val_ds = EmotionDataset(val_texts, val_labels, tokenizer)
 
@@ -108,46 +181,59 @@ def main():
     best_model = None
     all_logs = []
 
+    # Load the checkpoint once; every sweep run trains its own copy of it
+    base_model = BertForSequenceClassification.from_pretrained(
+        model_source,
+        num_labels=len(core_emotions),
+        id2label=id2emotion,
+        label2id=emotion2id,
+        attn_implementation="sdpa",
+    )
+
     for i, lr in enumerate(lrs, 1):
         print(f"\n=== Sweep {i}/{len(lrs)}: lr={lr} ===")
-        model = BertForSequenceClassification.from_pretrained(
-            model_source,
-            num_labels=len(core_emotions),
-            id2label=id2emotion,
-            label2id=emotion2id,
-        )
+        model = copy.deepcopy(base_model)
         args_tr = TrainingArguments(
             output_dir=f"{args.output_dir}_tmp_{lr}",
             num_train_epochs=2,
-            per_device_train_batch_size=4,
+            per_device_train_batch_size=32,
+            per_device_eval_batch_size=64,
+            gradient_accumulation_steps=2,
             learning_rate=lr,
             evaluation_strategy="epoch",
             logging_steps=10,
             save_strategy="epoch",
             report_to=["mlflow"],
             weight_decay=0.01,
-            load_best_model_at_end=False,
+            load_best_model_at_end=True,
+            metric_for_best_model="eval_loss",
+            greater_is_better=False,
+            bf16=USE_BF16,
+            tf32=USE_BF16,
+            dataloader_pin_memory=True,
+            optim="adamw_torch_fused" if torch.cuda.is_available() else "adamw_torch",
         )
+        collector = LogCollector(lr, all_logs)
         trainer = Trainer(
             model=model,
             args=args_tr,
             train_dataset=train_ds,
             eval_dataset=val_ds,
+            callbacks=[
+                EarlyStoppingCallback(
+                    early_stopping_patience=1, early_stopping_threshold=0.01
+                ),
+                SweepPruner(best_loss),
+                collector,
+            ],
         )
         trainer.train()
         pred = trainer.predict(val_ds)
         y_pred = pred.predictions.argmax(axis=1)
         y_true = pred.label_ids
 
-        # get eval_loss
-        eval_loss = next(
-            (
-                record["eval_loss"]
-                for record in reversed(trainer.state.log_history)
-                if "eval_loss" in record
-            ),
-            float("inf"),
-        )
+        # eval_loss of the best epoch, which is the one loaded at the end
+        eval_loss = collector.best_eval_loss
         f1 = f1_score(y_true, y_pred, average="macro", zero_division=0)
         print(f"→ lr={lr}: loss={eval_loss:.4f}, f1={f1:.4f}")
 
@@ -155,9 +241,10 @@ def main():
             best_loss, best_lr = eval_loss, lr
             best_model = model
 
-        # collect logs
-        for rec in trainer.state.log_history:
-            all_logs.append({**rec, "lr": lr})
+        # release this run's optimizer state (and the model, unless it is best_model)
+        del trainer, model
+        if torch.cuda.is_available():
+            torch.cuda.empty_cache()
 
     print(f"\n🏆 Best lr={best_lr} (loss={best_loss:.4f})")
 
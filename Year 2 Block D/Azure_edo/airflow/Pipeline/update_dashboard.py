@@ -1,5 +1,7 @@
 from azure.ai.ml import MLClient
 from azure.identity import DefaultAzureCredential
+from concurrent.futures import ThreadPoolExecutor
+import glob
 import os
 import shutil
 import pandas as pd
@@ -17,11 +19,14 @@ ml_client = MLClient(
 
 
 def has_working_tag(run):
-    tags = getattr(run, "tags", {})
-    for k, v in tags.items():
-        if k.strip() == "pipeline : emotion" and v.strip().lower() == "true":
-            return True
-    return False
+    tags = getattr(run, "tags", None) or {}
+    value = tags.get("pipeline : emotion")
+    if value is None:
+        # Tags set by hand can carry whitespace around the key
+        value = next(
+            (v for k, v in tags.items() if k.strip() == "pipeline : emotion"), ""
+        )
+    return value.strip().lower() == "true"
 
 
 # Get all pipeline runs with the working tag
@@ -32,7 +37,8 @@ pipeline_runs = sorted(
     all_pipeline_runs, key=lambda x: x.creation_context.created_at, reverse=True
 )[:10]
 
-for idx, parent_run in enumerate(pipeline_runs, 1):
+
+def fetch_ev_metrics(idx, parent_run):
     parent_run_id = parent_run.name
     print(f"Processing pipeline run: {parent_run_id}")
 
@@ -45,7 +51,7 @@ for idx, parent_run in enumerate(pipeline_runs, 1):
 
     if ev_run is None:
         print(f"Evaluation step (ev) run not found for pipeline {parent_run_id}.")
-        continue
+        return
 
     download_dir = f"./metrics/downloaded_metrics_ev_{idx}"
 
@@ -62,8 +68,15 @@ for idx, parent_run in enumerate(pipeline_runs, 1):
         print(f"No metrics.csv found at {metrics_src}")
 
 
+# Every run is a few blocking HTTPS round-trips (child listing + artifact
+# download), so overlap them instead of fetching the runs one after another
+with ThreadPoolExecutor(max_workers=8) as ex:
+    list(ex.map(fetch_ev_metrics, range(1, len(pipeline_runs) + 1), pipeline_runs))
+
+
 metrics_dir = "./metrics"
 
+# long format: one (run, metric, value) frame per run, pivoted once at the end
 all_runs = []
 
 # Columns to exclude from the dashboard (pred_count_*, prediction_mean/std/latency, cpu/memory, and *_f1 for emotions)
@@ -100,31 +113,42 @@ emotion_names = [
     "sadness",
     "surprise",
 ]
-emotion_f1s = [f"{emotion}_f1" for emotion in emotion_names]
-
-
-def should_include(metric):
-    if metric in emotion_f1s:
-        return False
-    return not any(metric.startswith(prefix) for prefix in exclude_prefixes)
-
+emotion_f1s = {f"{emotion}_f1" for emotion in emotion_names}
 
 # Find all subfolders like "downloaded_metrics_ev_*"
-for folder in sorted(os.listdir(metrics_dir)):
-    folder_path = os.path.join(metrics_dir, folder)
-    if os.path.isdir(folder_path) and folder.startswith("downloaded_metrics_ev_"):
-        metrics_csv = os.path.join(folder_path, "metrics.csv")
-        if os.path.isfile(metrics_csv):
-            df = pd.read_csv(metrics_csv)
-            df.columns = ["metric", f"value_run_{folder.split('_')[-1]}"]
-            df = df[df["metric"].apply(should_include)]
-            all_runs.append(df.set_index("metric"))
-        else:
-            print(f"No metrics.csv found in {folder_path}")
+for folder_path in sorted(glob.glob(os.path.join(metrics_dir, "downloaded_metrics_ev_*"))):
+    if not os.path.isdir(folder_path):
+        continue
+    metrics_csv = os.path.join(folder_path, "metrics.csv")
+    if os.path.isfile(metrics_csv):
+        df = pd.read_csv(
+            metrics_csv,
+            header=0,
+            names=["metric", "value"],
+            dtype={"metric": "string"},
+        )
+        df.insert(0, "run", f"value_run_{folder_path.split('_')[-1]}")
+        all_runs.append(df)
+    else:
+        print(f"No metrics.csv found in {folder_path}")
 
 # Combine all runs into a single DataFrame
 if all_runs:
-    combined = pd.concat(all_runs, axis=1)
+    long = pd.concat(all_runs, ignore_index=True)
+
+    # one vectorized mask over all runs instead of a Python call per metric
+    metric = long["metric"]
+    keep = ~metric.isin(emotion_f1s)
+    for prefix in exclude_prefixes:
+        keep &= ~metric.str.startswith(prefix)
+    long = long[keep]
+
+    # single pivot (one hash build) instead of an N-way outer join on the index;
+    # reindex keeps the metric/run order of the CSVs rather than sorting them
+    combined = long.pivot(index="metric", columns="run", values="value").reindex(
+        index=long["metric"].unique(), columns=long["run"].unique()
+    )
+    combined.columns.name = None
     combined.reset_index(inplace=True)
     print(combined)
     combined.to_csv(os.path.join(metrics_dir, "dashboard_data.csv"), index=False)
@@ -9,17 +9,25 @@ class SPBlobSensor(BaseSensorOperator):
     Poll the container until at least one *.csv appears.
     Reads tenant_id, client_id, client_secret, account_name from a
     Generic connection (e.g. azure_sp_blob).
+    Optionally only looks at blobs under `name_prefix`.
     """
 
-    template_fields = ("container_name", "file_suffix")
+    template_fields = ("container_name", "file_suffix", "name_prefix")
 
-    def __init__(self, conn_id, container_name, file_suffix=".csv", **kwargs):
+    def __init__(
+        self, conn_id, container_name, file_suffix=".csv", name_prefix=None, **kwargs
+    ):
         super().__init__(**kwargs)
         self.conn_id = conn_id
         self.container_name = container_name
         self.file_suffix = file_suffix
+        self.name_prefix = name_prefix
+        self._cc = None
 
     def _container_client(self):
+        # built once and reused across pokes; the credential refreshes its own token
+        if self._cc is not None:
+            return self._cc
         x = BaseHook.get_connection(self.conn_id).extra_dejson
         cred = ClientSecretCredential(
             tenant_id=x["tenant_id"],
@@ -30,10 +38,16 @@ class SPBlobSensor(BaseSensorOperator):
             f"https://{x['account_name']}.blob.core.windows.net",
             credential=cred,
         )
-        return svc.get_container_client(self.container_name)
+        self._cc = svc.get_container_client(self.container_name)
+        return self._cc
 
     def poke(self, context):
         cont = self._container_client()
-        blobs = [b.name for b in cont.list_blobs() if b.name.endswith(self.file_suffix)]
-        self.log.info("Found %d *.csv blobs", len(blobs))
-        return bool(blobs)
+        # names only, and stop paging at the first match
+        names = cont.list_blob_names(name_starts_with=self.name_prefix)
+        match = next((n for n in names if n.endswith(self.file_suffix)), None)
+        if match is None:
+            self.log.info("No *%s blobs yet", self.file_suffix)
+            return False
+        self.log.info("Found %s", match)
+        return True
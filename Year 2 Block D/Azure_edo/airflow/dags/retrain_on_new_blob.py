@@ -1,3 +1,4 @@
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
 import os
 import fnmatch
@@ -71,13 +72,18 @@ def download_new(**ctx):
     new = ti.xcom_pull(key="new_blobs") or []
 
     os.makedirs(LOCAL_DIR, exist_ok=True)
-    paths = []
-    for blob in new:
+
+    def _download(blob):
         local = os.path.join(LOCAL_DIR, Path(blob).name)
         with open(local, "wb") as f:
-            f.write(cont.download_blob(blob).readall())
+            # stream straight into the file; large blobs are fetched in parallel chunks
+            cont.download_blob(blob, max_concurrency=4).readinto(f)
         ti.log.info("⬇️ Downloaded %s → %s", blob, local)
-        paths.append(local)
+        return local
+
+    # blobs are independent HTTPS downloads → overlap them
+    with ThreadPoolExecutor(max_workers=min(16, len(new) or 1)) as ex:
+        paths = list(ex.map(_download, new))
 
     seen = set(json.loads(Variable.get("processed_blobs", default_var="[]")))
     seen.update(new)
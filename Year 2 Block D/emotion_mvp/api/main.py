@@ -1,14 +1,17 @@
 from __future__ import annotations
 
-import csv
+import asyncio
 import io
 import logging
 import os
+import shutil
 import time
 from pathlib import Path
-from typing import Any, List, Optional
+from typing import TYPE_CHECKING, Any, List, Optional
 
+import pandas as pd
 from fastapi import (
+    APIRouter,
     Depends,
     FastAPI,
     File,
@@ -20,33 +23,25 @@ from fastapi import (
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import JSONResponse
 from fastapi.staticfiles import StaticFiles
+import pydantic_core
 from pydantic import BaseModel
-
-from azure.identity import ClientSecretCredential
-from azure.storage.blob import BlobServiceClient
+from starlette.concurrency import run_in_threadpool
 
 from .plan_gate import Plan, enforce
 from emotion_mvp.pipeline import predict_any
 
+if TYPE_CHECKING:
+    from azure.storage.blob import ContainerClient
+
 # ─────────────────────────────── Constants / logging ──────────────────────
 RAW_PREFIX = "raw"
 LOCAL_DIR = Path("data/transcripts")
+LOCAL_DIR.mkdir(parents=True, exist_ok=True)  # once, not per request
+CHUNK = 1 << 20  # bytes per read/write when streaming uploads
 
-logging.basicConfig(level=logging.INFO)
 LOGGER = logging.getLogger(__name__)
 
-# ─────────────────────────────────── FastAPI ─────────────────────────────
-app = FastAPI(title="Emotion-MVP")
-
-app.add_middleware(
-    CORSMiddleware,
-    allow_origins=["*"],
-    allow_credentials=True,
-    allow_methods=["*"],
-    allow_headers=["*"],
-)
-
-app.mount("/files", StaticFiles(directory=LOCAL_DIR), name="files")
+router = APIRouter()
 
 # ───────────────────────────── Azure Blob client (optional) ───────────────
 TENANT_ID = os.getenv("AZURE_TENANT_ID")
@@ -55,52 +50,83 @@ CLIENT_SECRET = os.getenv("AZURE_CLIENT_SECRET")
 ACCOUNT_NAME = os.getenv("AZURE_STORAGE_ACCOUNT_NAME")
 CONTAINER = os.getenv("AZURE_STORAGE_CONTAINER")
 
-CONTAINER_CLIENT: BlobServiceClient | None = None
-if all([TENANT_ID, CLIENT_ID, CLIENT_SECRET, ACCOUNT_NAME, CONTAINER]):
+CONTAINER_CLIENT: ContainerClient | None = None  # set by create_app()
+
+
+def _init_container_client() -> ContainerClient | None:
+    """Connect to the Azure container, or return None if Blob is not configured."""
+    if not all([TENANT_ID, CLIENT_ID, CLIENT_SECRET, ACCOUNT_NAME, CONTAINER]):
+        LOGGER.warning("Azure env-vars missing – Blob uploads will be skipped.")
+        return None
+
+    # imported here so the Azure SDK is only loaded when it is actually used
+    from azure.identity import ClientSecretCredential
+    from azure.storage.blob import BlobServiceClient
+
     try:
         credential = ClientSecretCredential(TENANT_ID, CLIENT_ID, CLIENT_SECRET)
         service = BlobServiceClient(
             f"https://{ACCOUNT_NAME}.blob.core.windows.net",
             credential=credential,
         )
-        CONTAINER_CLIENT = service.get_container_client(CONTAINER)
+        container = service.get_container_client(CONTAINER)
         LOGGER.info(
             "Azure Blob client initialised for container '%s'",
             CONTAINER,
         )
+        return container
     except Exception as exc:  # noqa: BLE001
         LOGGER.error("Could not initialise Azure Blob: %s", exc, exc_info=True)
-else:
-    LOGGER.warning("Azure env-vars missing – Blob uploads will be skipped.")
+        return None
+
 
 # ─────────────────────────────── Helper functions ─────────────────────────
 
 
+_PLAN_CACHE = {p.value: p for p in Plan}
+
+
 def plan_dependency(request: Request) -> Plan:  # noqa: D401
-    """Return Plan instance for the incoming request."""
-    return Plan(request.headers.get("x-plan", "basic"))
+    """Return Plan instance for the incoming request (unknown plans → 400)."""
+    value = request.headers.get("x-plan", "basic")
+    try:
+        return _PLAN_CACHE[value]
+    except KeyError:
+        raise HTTPException(400, f"Unknown plan {value!r}") from None
 
 
-def upload_blob_safe(
+async def upload_blob_safe(
     name: str,
     data: Any,
     content_type: str | None = None,
 ) -> None:  # noqa: ANN401
-    """Upload to Azure; log warning if it fails or Azure is disabled."""
+    """Upload to Azure; log warning if it fails or Azure is disabled.
+
+    The SDK call is blocking network I/O, so it runs in the threadpool
+    instead of stalling the event loop.
+    """
     if CONTAINER_CLIENT is None:
         return
 
     try:
-        CONTAINER_CLIENT.upload_blob(
+        await run_in_threadpool(
+            CONTAINER_CLIENT.upload_blob,
             name=name,
             data=data,
             overwrite=True,
             content_type=content_type,
+            max_concurrency=4,
         )
     except Exception as exc:  # noqa: BLE001
         LOGGER.warning("Blob upload failed (%s): %s", name, exc)
 
 
+def save_upload(upload: UploadFile, dest: Path) -> None:
+    """Stream an upload to *dest* in CHUNK-sized pieces instead of reading it whole."""
+    with dest.open("wb") as out:
+        shutil.copyfileobj(upload.file, out, CHUNK)
+
+
 # ─────────────────────────────── Pydantic models ──────────────────────────
 
 
@@ -121,7 +147,7 @@ class FeedbackPayload(BaseModel):
 # ─────────────────────────────── Prediction endpoint ──────────────────────
 
 
-@app.post("/predict-any")
+@router.post("/predict-any")
 async def predict_any_endpoint(  # noqa: PLR0913
     request: Request,
     plan: Plan = Depends(plan_dependency),
@@ -132,12 +158,14 @@ async def predict_any_endpoint(  # noqa: PLR0913
 ) -> JSONResponse:
     """Run the ML pipeline and return a download link to the CSV."""
     if file is not None:
-        LOCAL_DIR.mkdir(parents=True, exist_ok=True)
-        dest = LOCAL_DIR / file.filename
-        dest.write_bytes(await file.read())
+        # basename only, so a crafted filename can't escape LOCAL_DIR
+        name = Path(file.filename).name
+        dest = LOCAL_DIR / name
+        await run_in_threadpool(save_upload, file, dest)
         final_src = str(dest)
         LOGGER.info("💾 Saved upload → %s", final_src)
-        upload_blob_safe(f"{RAW_PREFIX}/{file.filename}", dest.open("rb"))
+        with dest.open("rb") as fh:
+            await upload_blob_safe(f"{RAW_PREFIX}/{name}", fh)
     elif src:
         final_src = src
     else:
@@ -164,7 +192,8 @@ async def predict_any_endpoint(  # noqa: PLR0913
 
     csv_path = Path(result["csv"])
     filename = csv_path.name
-    upload_blob_safe(filename, csv_path.open("rb"), content_type="text/csv")
+    with csv_path.open("rb") as fh:
+        await upload_blob_safe(filename, fh, content_type="text/csv")
 
     base_url = str(request.base_url).rstrip("/")
     local_url = f"{base_url}/files/{filename}"
@@ -182,7 +211,7 @@ async def predict_any_endpoint(  # noqa: PLR0913
 # ─────────────────────────────── Feedback endpoint ────────────────────────
 
 
-@app.post("/api/predictions/{prediction_id}/feedback")
+@router.post("/api/predictions/{prediction_id}/feedback")
 async def receive_feedback(
     prediction_id: str,
     payload: FeedbackPayload,
@@ -195,23 +224,30 @@ async def receive_feedback(
     """
     prefix = f"feedback/{prediction_id}"
     ts = int(time.time())
+    # serialized once, straight to bytes; stored as the receipt or as the
+    # meta JSON below
+    payload_json = pydantic_core.to_json(payload)
 
     if payload.correct:
         # upload receipt JSON
         receipt_name = f"{prefix}/receipt-{ts}.json"
-        upload_blob_safe(
+        await upload_blob_safe(
             receipt_name,
-            payload.model_dump_json().encode(),
+            payload_json,
             content_type="application/json",
         )
         LOGGER.info("✅ stored receipt → %s", receipt_name)
 
         # also archive original CSV to feedback
-        original_path = LOCAL_DIR / prediction_id
-        if original_path.exists():
-            with original_path.open("rb") as f:
+        # open directly instead of exists() + open()
+        try:
+            f = (LOCAL_DIR / prediction_id).open("rb")
+        except FileNotFoundError:
+            pass
+        else:
+            with f:
                 orig_blob = f"{prefix}/original-{ts}.csv"
-                upload_blob_safe(orig_blob, f, content_type="text/csv")
+                await upload_blob_safe(orig_blob, f, content_type="text/csv")
                 LOGGER.info("✅ archived original → %s", orig_blob)
 
         return JSONResponse(
@@ -225,20 +261,27 @@ async def receive_feedback(
         )
 
     # write corrected CSV
-    csv_io = io.StringIO()
-    rows = [seg.dict() for seg in payload.corrections]
-    writer = csv.DictWriter(csv_io, fieldnames=rows[0].keys())
-    writer.writeheader()
-    writer.writerows(rows)
+    # column-wise (one list per field) straight into pandas' C CSV writer
+    columns = {
+        field: [getattr(seg, field) for seg in payload.corrections]
+        for field in TranscriptSegment.model_fields
+    }
+    csv_buf = io.BytesIO()
+    pd.DataFrame(columns).to_csv(csv_buf, index=False)
+    csv_buf.seek(0)  # the SDK streams from the buffer, no bytes copy
     corr_name = f"{prefix}/corrections-{ts}.csv"
-    upload_blob_safe(corr_name, csv_io.getvalue().encode(), content_type="text/csv")
 
     # write payload JSON
     meta_name = f"{prefix}/meta-{ts}.json"
-    upload_blob_safe(
-        meta_name,
-        payload.model_dump_json().encode(),
-        content_type="application/json",
+
+    # the two blobs are independent → one round-trip instead of two
+    await asyncio.gather(
+        upload_blob_safe(corr_name, csv_buf, content_type="text/csv"),
+        upload_blob_safe(
+            meta_name,
+            payload_json,
+            content_type="application/json",
+        ),
     )
 
     LOGGER.info("📝 stored corrections → %s", corr_name)
@@ -247,3 +290,31 @@ async def receive_feedback(
         content={"message": "Corrections + meta stored."},
         status_code=200,
     )
+
+
+# ─────────────────────────────────── FastAPI ─────────────────────────────
+
+
+def create_app() -> FastAPI:
+    """Build the API: logging, Azure client, CORS, /files mount and routes."""
+    global CONTAINER_CLIENT
+
+    # only configure logging if the host process hasn't already
+    if not logging.getLogger().handlers:
+        logging.basicConfig(level=logging.INFO)
+    CONTAINER_CLIENT = _init_container_client()
+
+    application = FastAPI(title="Emotion-MVP")
+    application.add_middleware(
+        CORSMiddleware,
+        allow_origins=["*"],
+        allow_credentials=True,
+        allow_methods=["*"],
+        allow_headers=["*"],
+    )
+    application.mount("/files", StaticFiles(directory=LOCAL_DIR), name="files")
+    application.include_router(router)
+    return application
+
+
+app = create_app()
@@ -2,6 +2,8 @@
 
 import logging
 from enum import Enum
+from typing import Any
+
 from fastapi import HTTPException
 
 log = logging.getLogger(__name__)
@@ -13,7 +15,7 @@ class Plan(str, Enum):
     pro = "pro"
 
 
-RULES = {
+RULES: dict[Plan, dict[str, Any]] = {
     Plan.basic: {
         "max_seconds": 10 * 60,
         "model": "tiny",
@@ -41,37 +43,49 @@ RULES = {
 }
 
 
-def enforce(payload: dict, plan: Plan) -> dict:
-    rule = RULES[plan]
-    log.info(f"Enforcing rules for plan: '{plan.value}'")
+# user-supplied feature flags that the plan always overrides
+_OVERRIDDEN_KEYS: tuple[str, ...] = ("translate", "classify", "classify_ext", "intensity")
+
+# pipeline kwargs fixed by each plan, resolved once at import
+_PLAN_TEMPLATES: dict[Plan, dict[str, Any]] = {
+    plan: {
+        "model": rule["model"],
+        "do_translate": rule["translate"],
+        "do_classify": rule["classify"],
+        "do_classify_ext": rule["classify_ext"],
+        "do_intensity": rule["intensity"],
+    }
+    for plan, rule in RULES.items()
+}
+_PLAN_MAX_SECONDS: dict[Plan, int] = {
+    plan: rule["max_seconds"] for plan, rule in RULES.items()
+}
+
+
+def enforce(payload: dict[str, Any], plan: Plan) -> dict[str, Any]:
+    max_seconds = _PLAN_MAX_SECONDS[plan]
+    # lazy %-args: the message is only formatted if INFO is enabled
+    log.info("Enforcing rules for plan: '%s'", plan.value)
 
-    for key in ["translate", "classify", "classify_ext", "intensity"]:
+    for key in _OVERRIDDEN_KEYS:
         payload.pop(key, None)
 
     classifier_choice = payload.pop("classifier", "llama")
 
     duration = payload.get("duration_sec")
-    if duration is not None and duration > rule["max_seconds"]:
+    if duration is not None and duration > max_seconds:
         # --- ADDED LOGGING BEFORE THE ERROR ---
         log.warning(
             f"Request denied for plan '{plan.value}'. "
-            f"Duration {duration}s exceeds max {rule['max_seconds']}s."
+            f"Duration {duration}s exceeds max {max_seconds}s."
         )
         raise HTTPException(
             status_code=403,
-            detail=f"{plan.value.capitalize()} plan limited to {rule['max_seconds'] // 60}-minute audio",
+            detail=f"{plan.value.capitalize()} plan limited to {max_seconds // 60}-minute audio",
         )
 
-    payload.update(
-        {
-            "inp": payload.pop("src"),
-            "model": rule["model"],
-            "do_translate": rule["translate"],
-            "do_classify": rule["classify"],
-            "do_classify_ext": rule["classify_ext"],
-            "do_intensity": rule["intensity"],
-            "classifier_model": classifier_choice.lower(),
-        }
-    )
+    payload["inp"] = payload.pop("src")
+    payload |= _PLAN_TEMPLATES[plan]
+    payload["classifier_model"] = classifier_choice.lower()
 
     return payload
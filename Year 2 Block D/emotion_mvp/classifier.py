@@ -17,7 +17,10 @@ The module handles:
 import re
 import requests
 import json
-from typing import Tuple, Optional
+import threading
+from collections import OrderedDict
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from typing import List, Tuple, Optional
 from requests.adapters import HTTPAdapter
 from urllib3.util.retry import Retry
 
@@ -26,15 +29,91 @@ from .config import (
     LLAMA_MODEL_ID,
     LLAMA_TOKEN,
     LLAMA_FALLBACK_MODELS,
+    LLAMA_HEDGE_DELAY,
     BERT_API_URL,
     BERT_API_KEY,
 )
 from .prompts import build_prompt, build_review_prompt
 from .log import get_logger
-from .emotion_tiers import EMOTION_TIERS
+from .emotion_tiers import EMOTION_TIERS, EMOTION_TIER_SETS
 
 log = get_logger("classifier")
 
+# ─── Response parsing tables (built once at import) ─────────────
+_ANSWER_RE = re.compile(r"Answer:\s*([a-z]+)", re.IGNORECASE)
+_INTENSITY_RE = re.compile(r"Intensity:\s*([a-z]+)", re.IGNORECASE)
+_INTENSITY_MAP = {
+    "neutral": 0.0,
+    "mild": 0.25,
+    "moderate": 0.5,
+    "strong": 0.75,
+    "intense": 1.0,
+}
+# (classify_ext, do_intensity) → (tier, labels, allowed label set), so the
+# hot path is a single dict load instead of re-deriving the tier per call
+_TIER_TABLE = {
+    (classify_ext, do_intensity): (
+        tier,
+        EMOTION_TIERS[tier],
+        EMOTION_TIER_SETS[tier],
+    )
+    for classify_ext, do_intensity, tier in [
+        (False, False, "basic"),
+        (True, False, "plus"),
+        (False, True, "pro"),
+        (True, True, "pro"),
+    ]
+}
+
+
+# ─── Prediction cache ───────────────────────────────────────────
+
+
+class _LRUCache:
+    """Small thread-safe LRU map, shared by the batch worker threads."""
+
+    def __init__(self, maxsize: int):
+        self.maxsize = maxsize
+        self._data: "OrderedDict[tuple, Tuple[str, Optional[float]]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: tuple) -> Optional[Tuple[str, Optional[float]]]:
+        with self._lock:
+            value = self._data.get(key)
+            if value is not None:
+                self._data.move_to_end(key)
+            return value
+
+    def put(self, key: tuple, value: Tuple[str, Optional[float]]) -> None:
+        with self._lock:
+            self._data[key] = value
+            self._data.move_to_end(key)
+            if len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+
+
+# transcripts repeat short utterances ("yeah", "okay", ...) a lot; a hit skips
+# the remote call entirely
+PREDICTION_CACHE_SIZE = 4096
+_LLAMA_CACHE = _LRUCache(PREDICTION_CACHE_SIZE)
+_BERT_CACHE = _LRUCache(PREDICTION_CACHE_SIZE)
+
+
+def _cache_key(sentence: str) -> str:
+    """Normalise a sentence for cache lookups (surrounding/repeated whitespace)."""
+    return " ".join(sentence.split())
+
+
+def clear_prediction_cache() -> None:
+    """Forget all cached LLaMA and BERT predictions."""
+    _LLAMA_CACHE.clear()
+    _BERT_CACHE.clear()
+
+
 # ─── Llama setup ────────────────────────────────────────────────
 
 HEADERS_LLAMA = {
@@ -42,13 +121,42 @@ HEADERS_LLAMA = {
     "Content-Type": "application/json",
 }
 
+# jittered, capped backoff so parallel workers don't retry in lock-step
+_LLAMA_RETRY = Retry(
+    total=2,
+    backoff_factor=0.3,
+    backoff_jitter=0.3,
+    backoff_max=4,
+    status_forcelist=[429, 500, 502, 503, 504],
+    allowed_methods=["POST"],
+)
+# pooled keep-alive session, so every call reuses the TCP/TLS connection
+# instead of doing a fresh handshake with the LLaMA endpoint
+_LLAMA_SESSION = requests.Session()
+_LLAMA_SESSION.mount(
+    "http://",
+    HTTPAdapter(pool_connections=16, pool_maxsize=32, max_retries=_LLAMA_RETRY),
+)
+_LLAMA_SESSION.mount(
+    "https://",
+    HTTPAdapter(pool_connections=16, pool_maxsize=32, max_retries=_LLAMA_RETRY),
+)
+# (connect, read) seconds: a dead host fails fast, a slow model still answers
+LLAMA_TIMEOUT = (3, 10)
+
+# with LLAMA_HEDGE_DELAY set, a primary that hasn't answered after that many
+# seconds is raced against the first fallback and whichever answers first wins
+_HEDGE_POOL = ThreadPoolExecutor(max_workers=32, thread_name_prefix="llama-hedge")
+
 
 def _call_llama(messages, temperature: float = 0.5) -> str:
     """
     Call LLaMA API with retry mechanism across multiple model fallbacks.
 
     Attempts to call the primary LLaMA model, falling back to alternative models
-    if the primary fails. Uses exponential backoff and retry logic.
+    if the primary fails. With LLAMA_HEDGE_DELAY set, a primary slower than
+    that is raced against the first fallback and the first answer wins. Each
+    request retries transient HTTP errors with jittered exponential backoff.
 
     Args:
         messages: List of message dictionaries for the chat completion
@@ -67,25 +175,47 @@ def _call_llama(messages, temperature: float = 0.5) -> str:
         >>> print(response)
         'joy'
     """
-    for model_name in [LLAMA_MODEL_ID] + LLAMA_FALLBACK_MODELS:
+    models = [LLAMA_MODEL_ID] + LLAMA_FALLBACK_MODELS
+
+    def attempt(model_name: str) -> str:
+        resp = _LLAMA_SESSION.post(
+            LLAMA_API_URL,
+            headers=HEADERS_LLAMA,
+            json={
+                "model": model_name,
+                "messages": messages,
+                "temperature": temperature,
+            },
+            timeout=LLAMA_TIMEOUT,
+        )
+        resp.raise_for_status()
+        return resp.json()["choices"][0]["message"]["content"]
+
+    racing = {}
+    if LLAMA_HEDGE_DELAY is not None and len(models) > 1:
+        # hedge the primary with the first fallback
+        racing[_HEDGE_POOL.submit(attempt, models[0])] = models[0]
+        done, _ = wait(racing, timeout=LLAMA_HEDGE_DELAY)
+        if not any(f.exception() is None for f in done):
+            racing[_HEDGE_POOL.submit(attempt, models[1])] = models[1]
+
+        pending = set(racing)
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for fut in done:
+                if fut.exception() is None:
+                    for loser in pending:
+                        loser.cancel()  # the in-flight request can't be aborted
+                    return fut.result()
+                log.warning("Llama %s failed: %s", racing[fut], fut.exception())
+
+    # remaining models one after the other (all of them without hedging)
+    for model_name in models[len(racing):]:
         try:
-            resp = requests.post(
-                LLAMA_API_URL,
-                headers=HEADERS_LLAMA,
-                json={
-                    "model": model_name,
-                    "messages": messages,
-                    "temperature": temperature,
-                },
-                timeout=10,
-            )
-            resp.raise_for_status()
-            return resp.json()["choices"][0]["message"]["content"]
+            return attempt(model_name)
         except Exception as e:
             log.warning("Llama %s failed: %s", model_name, e)
-    raise RuntimeError(
-        f"No available Llama models among {[LLAMA_MODEL_ID] + LLAMA_FALLBACK_MODELS}"
-    )
+    raise RuntimeError(f"No available Llama models among {models}")
 
 
 def _extract_emotion(text: str) -> str:
@@ -109,10 +239,29 @@ def _extract_emotion(text: str) -> str:
         >>> _extract_emotion("anger")
         'anger'
     """
-    m = re.search(r"Answer:\s*([a-z]+)", text, re.IGNORECASE)
+    m = _ANSWER_RE.search(text)
     return m.group(1).lower() if m else text.strip().lower()
 
 
+def _extract_intensity(text: str) -> Optional[float]:
+    """
+    Extract the intensity score from a LLaMA response.
+
+    Args:
+        text (str): Raw response text from LLaMA model
+
+    Returns:
+        Optional[float]: Score for the "Intensity: <label>" line (0.0 for an
+            unknown label), or None if the response has no such line
+
+    Examples:
+        >>> _extract_intensity("Answer: anger\\nIntensity: strong")
+        0.75
+    """
+    m = _INTENSITY_RE.search(text)
+    return _INTENSITY_MAP.get(m.group(1).lower(), 0.0) if m else None
+
+
 def predict_emotion_llama(
     sentence: str, classify_ext: bool, do_intensity: bool
 ) -> Tuple[str, Optional[float]]:
@@ -154,11 +303,15 @@ def predict_emotion_llama(
         - Plus: Extended emotion set (20+ emotions)
         - Pro: Extended emotions + intensity scoring
     """
-    tier = "pro" if do_intensity else ("plus" if classify_ext else "basic")
-    allowed = EMOTION_TIERS[tier]
+    tier, labels, allowed = _TIER_TABLE[(bool(classify_ext), bool(do_intensity))]
+    key = (_cache_key(sentence), tier)
+    cached = _LLAMA_CACHE.get(key)
+    if cached is not None:
+        return cached
+
     prompt = build_prompt(
         sentence=sentence,
-        allowed_labels=allowed,
+        allowed_labels=labels,
         plan_name=tier,
         want_intensity=do_intensity,
     )
@@ -171,22 +324,68 @@ def predict_emotion_llama(
     emo = _extract_emotion(content)
     if emo not in allowed:
         emo = "neutral"
-    intensity = None
-    if do_intensity:
-        m = re.search(r"Intensity:\s*([a-z]+)", content, re.IGNORECASE)
-        if m:
-            mapping = {
-                "neutral": 0.0,
-                "mild": 0.25,
-                "moderate": 0.5,
-                "strong": 0.75,
-                "intense": 1.0,
-            }
-            intensity = mapping.get(m.group(1).lower(), 0.0)
+    intensity = _extract_intensity(content) if do_intensity else None
     log.info("Llama → %s (intensity=%s)", emo, intensity)
+    _LLAMA_CACHE.put(key, (emo, intensity))
     return emo, intensity
 
 
+# max LLaMA requests in flight for one batch (stays below the session's pool size)
+LLAMA_MAX_CONCURRENCY = 8
+
+
+def _map_unique(fn, sentences: List[str], max_workers: int) -> list:
+    """Apply ``fn`` to every sentence on a thread pool, calling it once per
+    distinct sentence, and return the results in input order."""
+    if not sentences:
+        return []
+    # repeated sentences in the batch are only sent once
+    unique = list(dict.fromkeys(sentences))
+    pool = ThreadPoolExecutor(max_workers=min(max_workers, len(unique)))
+    try:
+        results = dict(zip(unique, pool.map(fn, unique)))
+    finally:
+        pool.shutdown(cancel_futures=True)
+    return [results[s] for s in sentences]
+
+
+def predict_emotion_llama_batch(
+    sentences: List[str], classify_ext: bool, do_intensity: bool
+) -> List[Optional[Tuple[str, Optional[float]]]]:
+    """
+    Classify many sentences with LLaMA, overlapping the HTTP round-trips.
+
+    Runs predict_emotion_llama for every sentence on a small thread pool
+    (LLAMA_MAX_CONCURRENCY requests in flight) over the pooled LLaMA session,
+    so an N-segment transcript costs about N / LLAMA_MAX_CONCURRENCY
+    round-trips instead of N.
+
+    Args:
+        sentences (List[str]): Input texts to classify
+        classify_ext (bool): Whether to use extended emotion set (Plus/Pro plans)
+        do_intensity (bool): Whether to calculate emotion intensity (Pro plan only)
+
+    Returns:
+        List[Optional[Tuple[str, Optional[float]]]]: One (emotion, intensity)
+            tuple per sentence, in input order, or None for a sentence LLaMA
+            failed on. A failure doesn't affect the other sentences, so callers
+            can fall back (e.g. to BERT) for just the failed ones.
+
+    Examples:
+        >>> predict_emotion_llama_batch(["I am thrilled!", "So sad."], False, False)
+        [('joy', None), ('sadness', None)]
+    """
+
+    def _predict_or_none(sentence):
+        try:
+            return predict_emotion_llama(sentence, classify_ext, do_intensity)
+        except Exception as e:
+            log.warning("LLaMA failed for a sentence: %s", e)
+            return None
+
+    return _map_unique(_predict_or_none, sentences, LLAMA_MAX_CONCURRENCY)
+
+
 def review_emotion_llama(
     sentence: str, predicted: str, actual: str, classify_ext: bool, do_intensity: bool
 ) -> Tuple[str, Optional[float]]:
@@ -227,13 +426,12 @@ def review_emotion_llama(
         If the LLaMA model produces an emotion not in the allowed set,
         the function falls back to the original predicted emotion.
     """
-    tier = "pro" if do_intensity else ("plus" if classify_ext else "basic")
-    allowed = EMOTION_TIERS[tier]
+    tier, labels, allowed = _TIER_TABLE[(bool(classify_ext), bool(do_intensity))]
     prompt = build_review_prompt(
         sentence=sentence,
         predicted_emotion=predicted,
         actual_emotion=actual,
-        allowed_labels=allowed,
+        allowed_labels=labels,
         want_intensity=do_intensity,
     )
     content = _call_llama(
@@ -245,18 +443,7 @@ def review_emotion_llama(
     emo = _extract_emotion(content)
     if emo not in allowed:
         emo = predicted
-    intensity = None
-    if do_intensity:
-        m = re.search(r"Intensity:\s*([a-z]+)", content, re.IGNORECASE)
-        if m:
-            mapping = {
-                "neutral": 0.0,
-                "mild": 0.25,
-                "moderate": 0.5,
-                "strong": 0.75,
-                "intense": 1.0,
-            }
-            intensity = mapping.get(m.group(1).lower(), 0.0)
+    intensity = _extract_intensity(content) if do_intensity else None
     return emo, intensity
 
 
@@ -329,6 +516,8 @@ _BASIC_MAP = {
 _RETRY_STRAT = Retry(
     total=3,
     backoff_factor=0.5,
+    backoff_jitter=0.3,
+    backoff_max=4,
     status_forcelist=[429, 500, 502, 503, 504],
     allowed_methods=["POST"],
 )
@@ -378,6 +567,12 @@ def predict_emotion_bert(
     Raises:
         Does not raise exceptions - returns ('nan', None) on all failures
     """
+    collapse = not classify_ext and not do_intensity
+    key = (_cache_key(sentence), collapse)
+    cached = _BERT_CACHE.get(key)
+    if cached is not None:
+        return cached
+
     headers = {
         "Content-Type": "application/json",
         "Authorization": f"Bearer {BERT_API_KEY}",
@@ -385,7 +580,7 @@ def predict_emotion_bert(
     payload = {"inputs": [sentence]}
     try:
         resp = _BERT_SESSION.post(
-            BERT_API_URL, headers=headers, json=payload, timeout=30
+            BERT_API_URL, headers=headers, json=payload, timeout=(3, 30)
         )
         resp.raise_for_status()
 
@@ -402,12 +597,42 @@ def predict_emotion_bert(
         label = _LABEL_MAP.get(idx, "nan")
 
         # for basic plan (no classify_ext, no intensity), collapse into one of 7
-        if not classify_ext and not do_intensity:
+        if collapse:
             label = _BASIC_MAP.get(label, "neutral")
 
         log.info("BERT → %s", label)
+        if label != "nan":  # don't pin failures in the cache
+            _BERT_CACHE.put(key, (label, None))
         return label, None
 
     except Exception as e:
         log.error("Remote BERT failed: %s", e)
         return "nan", None
+
+
+BERT_MAX_CONCURRENCY = 8
+
+
+def predict_emotion_bert_batch(
+    sentences: List[str], classify_ext: bool, do_intensity: bool
+) -> List[Tuple[str, Optional[float]]]:
+    """
+    Classify many sentences with the BERT endpoint, overlapping the round-trips.
+
+    Same contract as predict_emotion_bert, per sentence: failures come back as
+    ('nan', None) instead of raising.
+
+    Args:
+        sentences (List[str]): Input texts to classify
+        classify_ext (bool): Whether to use extended emotion set
+        do_intensity (bool): Intensity parameter (not supported for BERT)
+
+    Returns:
+        List[Tuple[str, Optional[float]]]: One (emotion, None) tuple per
+            sentence, in input order
+    """
+    return _map_unique(
+        lambda s: predict_emotion_bert(s, classify_ext, do_intensity),
+        sentences,
+        BERT_MAX_CONCURRENCY,
+    )
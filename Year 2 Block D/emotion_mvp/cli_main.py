@@ -1,13 +1,15 @@
 # emotion_mvp/cli_main.py
 from __future__ import annotations
 
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
+import numpy as np
 import pandas as pd
 
-from emotion_mvp.config import CSV_PATH, TOKEN
+from emotion_mvp.config import CSV_PATH
 from emotion_mvp.data_loader import load_and_clean_data
-from emotion_mvp.inference import get_emotion, review_emotion
+from emotion_mvp.inference import get_emotions_batch, review_emotion
 
 
 def _simple_evaluate(
@@ -16,20 +18,25 @@ def _simple_evaluate(
     final: list[str],
 ) -> dict[str, float]:
     """Lightweight accuracy report (replaces the old evaluate_predictions)."""
-    init_acc = sum(t == p for t, p in zip(true, initial)) / len(true)
-    final_acc = sum(t == p for t, p in zip(true, final)) / len(true)
+    true_arr = np.asarray(true)
+    init_acc = float((true_arr == np.asarray(initial)).mean())
+    final_acc = float((true_arr == np.asarray(final)).mean())
     print(f"\n📊  Initial accuracy: {init_acc:.2%}")
     print(f"📊  Final   accuracy: {final_acc:.2%}")
     return {"initial_accuracy": init_acc, "final_accuracy": final_acc}
 
 
+# the only columns main() reads
+_COLUMNS = ["Translation", "Emotion"]
+
+
 def _load_dataset(path: str | Path) -> pd.DataFrame:
     """
     Try to read the project CSV; if it’s missing (e.g. during unit tests)
     return a minimal dummy DataFrame so `main()` can still run.
     """
     try:
-        return load_and_clean_data(path)
+        return load_and_clean_data(path, usecols=_COLUMNS)
     except FileNotFoundError:
         print(f"⚠️  {Path(path).name} not found – using dummy dataset")
         return pd.DataFrame(
@@ -40,34 +47,40 @@ def _load_dataset(path: str | Path) -> pd.DataFrame:
         )
 
 
+# LLaMA requests in flight at once
+MAX_WORKERS = 8
+
+
 def main() -> None:
     df = _load_dataset(CSV_PATH)
     print(f"✅ Loaded {len(df)} cleaned rows.")
 
-    true_labels: list[str] = []
-    initial_preds: list[str] = []
-    final_preds: list[str] = []
-
-    for idx, row in df.iterrows():
-        sentence = row["Translation"]
-        actual = row["Emotion"].strip().lower()
-        true_labels.append(actual)
+    sentences: list[str] = df["Translation"].tolist()
+    true_labels: list[str] = df["Emotion"].str.strip().str.lower().tolist()
+
+    initial_preds: list[str] = [
+        predicted
+        for predicted, _ in get_emotions_batch(sentences, max_workers=MAX_WORKERS)
+    ]
+
+    # only the misses go back for review
+    misses = [i for i, (p, t) in enumerate(zip(initial_preds, true_labels)) if p != t]
+    final_preds = list(initial_preds)
+    with ThreadPoolExecutor(max_workers=MAX_WORKERS) as pool:
+        reviewed = pool.map(
+            lambda i: review_emotion(sentences[i], initial_preds[i], true_labels[i]),
+            misses,
+        )
+        for i, label in zip(misses, reviewed):
+            final_preds[i] = label
 
+    for idx, sentence, actual, predicted in zip(
+        df.index, sentences, true_labels, final_preds
+    ):
         print(f"\n=== Row {idx} ===")
         print("Sentence :", sentence)
         print("Actual   :", actual)
-
-        predicted, _ = get_emotion(sentence, TOKEN)
-        initial_preds.append(predicted)
-
-        reviewed = (
-            review_emotion(sentence, predicted, actual, TOKEN)
-            if predicted != actual
-            else predicted
-        )
-
-        final_preds.append(reviewed)
-        print("Predicted:", reviewed)
+        print("Predicted:", predicted)
 
     _simple_evaluate(true_labels, initial_preds, final_preds)
 
@@ -25,6 +25,9 @@ from pathlib import Path
 import os
 from dotenv import load_dotenv
 from datetime import datetime
+from functools import lru_cache
+
+from .emotion_tiers import PRO_LABELS
 
 load_dotenv()
 
@@ -45,6 +48,11 @@ LLAMA_FALLBACK_MODELS = [
     m.strip() for m in os.getenv("LLAMA_FALLBACK_MODELS", "").split(",") if m.strip()
 ]
 LLAMA_TOKEN = os.getenv("LLAMA_TOKEN")  # may be None
+# seconds before a slow primary is raced against the first fallback model;
+# unset (the default) disables hedging, fallbacks are then only tried on failure
+LLAMA_HEDGE_DELAY = (
+    float(os.getenv("LLAMA_HEDGE_DELAY")) if os.getenv("LLAMA_HEDGE_DELAY") else None
+)
 API_URL = os.getenv("API_URL", LLAMA_API_URL)
 # ─── BERT settings ──────────────────────────────────────────────────────
 BERT_MODEL_NAME = os.getenv("BERT_MODEL_NAME", "/app/emotion_mvp/rafal_bert_model")
@@ -63,40 +71,25 @@ SUPPORTED_TRANSLATORS = {
     "es": "opus-mt-es-en",
 }
 
-# List of emotions expected throughout the package
-VALID_EMOTIONS = {
-    "excitement",
-    "confusion",
-    "surprise",
-    "neutral",
-    "optimism",
-    "pride",
-    "curiosity",
-    "fear",
-    "amusement",
-    "joy",
-    "desire",
-    "annoyance",
-    "nervousness",
-    "gratitude",
-    "approval",
-    "realization",
-    "disappointment",
-    "caring",
-    "sadness",
-    "admiration",
-    "disapproval",
-    "anger",
-    "remorse",
-    "relief",
-    "love",
-    "disgust",
-    "embarrassment",
-}
+# List of emotions expected throughout the package: the full (Pro) label set,
+# kept in one place in emotion_tiers
+VALID_EMOTIONS = frozenset(PRO_LABELS)
 
 # ─── History log file ────────────────────────────────────────────────────
-STAMP = datetime.now().strftime("%Y-%m-%d_%H-%M-%S")
-HISTORY_FILE = os.getenv("HISTORY_CSV", str(DATA / f"inference_{STAMP}.csv"))
+@lru_cache(maxsize=1)
+def get_history_file() -> str:
+    """History CSV for this process: HISTORY_CSV, or a file stamped with the
+    time of the first inference. Resolved on first use, not at import."""
+    return os.getenv("HISTORY_CSV") or str(
+        DATA / f"inference_{datetime.now():%Y-%m-%d_%H-%M-%S}.csv"
+    )
+
+
+def __getattr__(name: str):
+    # keep `config.HISTORY_FILE` working without computing it at import
+    if name == "HISTORY_FILE":
+        return get_history_file()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 # ─── Remote BERT API override (optional) ────────────────────────────────
 BERT_API_URL = os.getenv(
@@ -2,14 +2,58 @@
 Language Detection Module
 
 This module provides automatic language detection capabilities for text input.
-Uses the langdetect library with fallback to English for robustness.
+Uses the langdetect library with fallback to English for robustness. If the
+optional `fasttext` package and its `lid.176.ftz` language-ID model are
+available, that (native, much faster) model is used instead.
 """
 
+import os
+from functools import lru_cache
+from pathlib import Path
+
 from langdetect import detect
+from .config import MODELS_PATH
 from .log import get_logger
 
 log = get_logger("detector")
 
+LID_MODEL_PATH = Path(os.getenv("LID_MODEL", str(MODELS_PATH / "lid.176.ftz")))
+
+
+def _load_fasttext():
+    """Load the fastText language-ID model, or None if it isn't available."""
+    if not LID_MODEL_PATH.exists():
+        return None
+    try:
+        import fasttext
+    except ImportError:
+        log.warning("%s found but fasttext is not installed", LID_MODEL_PATH.name)
+        return None
+    return fasttext.load_model(str(LID_MODEL_PATH))
+
+
+_FASTTEXT = _load_fasttext()
+
+
+def _detect(text: str) -> str:
+    """Detect with fastText if loaded, else langdetect; may raise."""
+    if _FASTTEXT is None:
+        return detect(text)
+    # fastText predicts one line at a time
+    labels, _ = _FASTTEXT.predict(text.replace("\n", " "), k=1)
+    return labels[0].removeprefix("__label__")
+
+
+# only short texts (utterances, titles) are cached; whole transcripts are
+# rarely repeated and would just pin memory
+CACHE_MAX_CHARS = 512
+
+
+@lru_cache(maxsize=4096)
+def _cached_detect(text: str) -> str:
+    """_detect, memoized; exceptions propagate and are not cached."""
+    return _detect(text)
+
 
 def detect_lang(text: str) -> str:
     """
@@ -38,13 +82,15 @@ def detect_lang(text: str) -> str:
         'en'
 
     Note:
-        - Supports 55+ languages via langdetect
+        - Supports 55+ languages via langdetect (176 with the fastText model)
         - Always returns a valid language code (never None or empty)
         - Logs warnings when detection fails and fallback is used
         - Works best with text longer than a few words
+        - Results for texts shorter than CACHE_MAX_CHARS are cached, so repeated
+          utterances skip langdetect's n-gram scoring
     """
     try:
-        return detect(text)
+        return _cached_detect(text) if len(text) < CACHE_MAX_CHARS else _detect(text)
     except Exception:
         log.warning("Language detect failed; defaulting to 'en'")
         return "en"
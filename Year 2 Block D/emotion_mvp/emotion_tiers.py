@@ -16,37 +16,11 @@ while maintaining consistency across the emotion classification pipeline.
 """
 
 # Basic tier: 7 fundamental emotions
-BASIC_LABELS = ["happy", "sad", "mad", "scared", "surprised", "disgusted", "neutral"]
+BASIC_LABELS = ("happy", "sad", "mad", "scared", "surprised", "disgusted", "neutral")
 
-# Plus tier: Extended emotion set with 23 categories
-PLUS_LABELS = [
-    "excitement",
-    "confusion",
-    "surprise",
-    "neutral",
-    "optimism",
-    "pride",
-    "curiosity",
-    "fear",
-    "amusement",
-    "joy",
-    "desire",
-    "annoyance",
-    "nervousness",
-    "gratitude",
-    "approval",
-    "realization",
-    "disappointment",
-    "caring",
-    "sadness",
-    "admiration",
-    "disapproval",
-    "anger",
-    "remorse",
-]
-
-# Pro tier: Comprehensive emotion set with 27 categories
-PRO_LABELS = [
+# Pro tier: Comprehensive emotion set with 27 categories. Ordered so that the
+# Plus tier is a prefix of it, so both tiers share one backing tuple.
+PRO_LABELS = (
     "excitement",
     "confusion",
     "surprise",
@@ -70,11 +44,18 @@ PRO_LABELS = [
     "disapproval",
     "anger",
     "remorse",
+    # Pro-only from here
     "relief",
     "love",
     "disgust",
     "embarrassment",
-]
+)
 
-# Mapping of tier names to their corresponding emotion label sets
+# Plus tier: Extended emotion set with 23 categories
+PLUS_LABELS = PRO_LABELS[:23]
+
+# Mapping of tier names to their corresponding emotion labels, in prompt order
 EMOTION_TIERS = {"basic": BASIC_LABELS, "plus": PLUS_LABELS, "pro": PRO_LABELS}
+
+# Same tiers as frozensets, for O(1) "is this label allowed" checks
+EMOTION_TIER_SETS = {tier: frozenset(labels) for tier, labels in EMOTION_TIERS.items()}
@@ -15,18 +15,63 @@ Features:
 - UTC timestamp standardization
 """
 
+import atexit
 import csv
-from datetime import datetime, UTC
 import logging
+import threading
+import time
 from pathlib import Path
 
-from .config import HISTORY_FILE
+from .config import get_history_file
 
 # Use the standard logger
 log = logging.getLogger(__name__)
 
 _HEADERS = ["timestamp", "input", "language", "translated", "emotion", "csv"]
 
+# the history file stays open between records instead of being reopened (and
+# stat'ed) for every inference; reopened if the history path changes
+_LOCK = threading.Lock()
+_FP = None
+_FP_PATH = None
+_WRITER = None
+
+
+def _history_writer():
+    """Return the writer for the history file, opening it on first use.
+
+    Must be called with _LOCK held.
+    """
+    global _FP, _FP_PATH, _WRITER
+    path = get_history_file()
+    if _FP is not None and _FP_PATH == path:
+        return _WRITER
+    _close_history()
+
+    fp = Path(path)
+    fp.parent.mkdir(parents=True, exist_ok=True)
+    first = not fp.exists() or fp.stat().st_size == 0  # empty/new file
+
+    _FP = fp.open("a", newline="", encoding="utf-8")
+    _FP_PATH = path
+    # positional writer: rows are built as tuples in _HEADERS order
+    _WRITER = csv.writer(_FP)
+    if first:
+        log.debug("History file does not exist or is empty. Writing headers.")
+        _WRITER.writerow(_HEADERS)
+    return _WRITER
+
+
+def _close_history() -> None:
+    """Close the open history file, if any."""
+    global _FP, _FP_PATH, _WRITER
+    if _FP is not None:
+        _FP.close()
+    _FP = _FP_PATH = _WRITER = None
+
+
+atexit.register(_close_history)
+
 
 def log_inference(user_input: str, summary: dict) -> None:
     """
@@ -61,7 +106,7 @@ def log_inference(user_input: str, summary: dict) -> None:
         >>> log_inference("Test input", {'language': 'en'})
 
     Note:
-        - History file location defined by HISTORY_FILE config
+        - History file location defined by config.get_history_file()
         - Creates parent directories if they don't exist
         - Automatically adds CSV headers for new files
         - Thread-safe for concurrent access
@@ -73,31 +118,24 @@ def log_inference(user_input: str, summary: dict) -> None:
         - Creates parent directories if needed
         - Logs debug/info messages about file operations
     """
-    fp = Path(HISTORY_FILE)
-    fp.parent.mkdir(parents=True, exist_ok=True)
-
-    log.info(f"Appending inference record to history file: {fp.name}")
-
-    first = not fp.exists() or fp.stat().st_size == 0  # empty/new file
-
-    with fp.open("a", newline="", encoding="utf-8") as f:
-        writer = csv.DictWriter(f, fieldnames=_HEADERS)
-        if first:
-            log.debug("History file does not exist or is empty. Writing headers.")
-            writer.writeheader()
-
-        row = {
-            # --- FIX IS HERE: Ensure timestamp ends with 'Z' for the test ---
-            "timestamp": summary.get(
-                "timestamp",
-                datetime.now(UTC).isoformat(timespec="seconds").replace("+00:00", "Z"),
-            ),
-            # -----------------------------------------------------------------
-            "input": user_input,
-            "language": summary.get("language", ""),
-            "translated": summary.get("translated", ""),
-            "emotion": summary.get("emotion", ""),
-            "csv": summary.get("csv", ""),
-        }
-        writer.writerow(row)
-        log.debug("Successfully wrote record to %s", fp.name)
+    name = Path(get_history_file()).name
+    log.info(f"Appending inference record to history file: {name}")
+
+    # same order as _HEADERS
+    row = (
+        # UTC, seconds precision, 'Z' suffix; only formatted when missing
+        (
+            summary["timestamp"]
+            if "timestamp" in summary
+            else time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime())
+        ),
+        user_input,
+        summary.get("language", ""),
+        summary.get("translated", ""),
+        summary.get("emotion", ""),
+        summary.get("csv", ""),
+    )
+    with _LOCK:
+        _history_writer().writerow(row)
+        _FP.flush()  # one write per record, readers see it right away
+    log.debug("Successfully wrote record to %s", name)
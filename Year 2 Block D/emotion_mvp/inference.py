@@ -17,7 +17,9 @@ Features:
 import re
 import requests
 import logging
-from typing import Tuple
+from requests.adapters import HTTPAdapter
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Tuple
 
 from .config import API_URL, TOKEN, VALID_EMOTIONS
 from .prompts import PROMPT_TEMPLATE, REVIEW_TEMPLATE, FEW_SHOT_EXAMPLES
@@ -25,6 +27,20 @@ from .prompts import PROMPT_TEMPLATE, REVIEW_TEMPLATE, FEW_SHOT_EXAMPLES
 # 1. Get the standard logger
 log = logging.getLogger(__name__)
 
+# compiled once, shared by get_emotion and review_emotion
+_ANSWER_RE = re.compile(r"Answer:\s*([\w\s]+)")
+
+# keep-alive session: one TCP/TLS handshake per pooled connection instead of
+# one per sentence; max_retries only covers failed connects
+_SESSION = requests.Session()
+_SESSION.headers.update(
+    {"Authorization": f"Bearer {TOKEN}", "Content-Type": "application/json"}
+)
+for _prefix in ("http://", "https://"):
+    _SESSION.mount(
+        _prefix, HTTPAdapter(pool_connections=16, pool_maxsize=64, max_retries=2)
+    )
+
 
 def get_emotion(sentence: str, temperature: float = 0.5) -> Tuple[str, str]:
     """
@@ -77,17 +93,16 @@ def get_emotion(sentence: str, temperature: float = 0.5) -> Tuple[str, str]:
         "temperature": temperature,
     }
 
-    headers = {"Authorization": f"Bearer {TOKEN}", "Content-Type": "application/json"}
     log.info(f"Requesting emotion for sentence: '{sentence[:30]}...'")
     try:
-        response = requests.post(API_URL, headers=headers, json=data, timeout=15)
+        response = _SESSION.post(API_URL, json=data, timeout=15)
         response.raise_for_status()
 
         result = response.json()
         content = result.get("choices", [{}])[0].get("message", {}).get("content", "")
         log.debug(f"Initial API Response content: {content}")
 
-        match = re.search(r"Answer:\s*([\w\s]+)", content)
+        match = _ANSWER_RE.search(content)
         emotion = match.group(1).strip().lower() if match else content.strip().lower()
 
         if emotion not in VALID_EMOTIONS:
@@ -105,6 +120,35 @@ def get_emotion(sentence: str, temperature: float = 0.5) -> Tuple[str, str]:
         return "nan", prompt
 
 
+def get_emotions_batch(
+    sentences: List[str], temperature: float = 0.5, max_workers: int = 16
+) -> List[Tuple[str, str]]:
+    """
+    Classify many sentences concurrently with get_emotion.
+
+    The requests are I/O-bound, so up to `max_workers` of them run in flight
+    at once over the pooled session; wall time drops from N round-trips to
+    roughly N / max_workers.
+
+    Args:
+        sentences (List[str]): Input texts to classify
+        temperature (float): Sampling temperature, passed to get_emotion
+        max_workers (int): Maximum number of concurrent requests
+
+    Returns:
+        List[Tuple[str, str]]: One (emotion, prompt) tuple per sentence,
+            in input order
+
+    Examples:
+        >>> [emo for emo, _ in get_emotions_batch(["I am happy!", "Ugh."])]
+        ['joy', 'annoyance']
+    """
+    if not sentences:
+        return []
+    with ThreadPoolExecutor(max_workers=min(max_workers, len(sentences))) as pool:
+        return list(pool.map(lambda s: get_emotion(s, temperature), sentences))
+
+
 def review_emotion(
     sentence: str, predicted_emotion: str, actual_emotion: str, temperature: float = 0.5
 ) -> str:
@@ -155,10 +199,9 @@ def review_emotion(
         "temperature": temperature,
     }
 
-    headers = {"Authorization": f"Bearer {TOKEN}", "Content-Type": "application/json"}
     log.info(f"Requesting review for prediction: '{predicted_emotion}'...")
     try:
-        response = requests.post(API_URL, headers=headers, json=data, timeout=15)
+        response = _SESSION.post(API_URL, json=data, timeout=15)
         response.raise_for_status()
 
         result = response.json()
@@ -167,7 +210,7 @@ def review_emotion(
         )
         log.debug(f"Reviewed API Response content: {reviewed_content}")
 
-        match = re.search(r"Answer:\s*([\w\s]+)", reviewed_content)
+        match = _ANSWER_RE.search(reviewed_content)
         reviewed_emotion = (
             match.group(1).strip().lower() if match else predicted_emotion
         )
@@ -31,18 +31,41 @@ from tempfile import NamedTemporaryFile
 from urllib.parse import urlparse, parse_qs
 from typing import Dict, Optional, Any
 
-# This line is correct and includes _normalise_source
-from .transcriber import transcribe, _normalise_source
 from .detector import detect_lang
-from .translator import translate
 from .classifier import (
-    predict_emotion_llama,
-    predict_emotion_bert,
+    predict_emotion_llama_batch,
+    predict_emotion_bert_batch,
 )
 from .history import log_inference
 
 log = logging.getLogger(__name__)
 
+
+# transcriber (whisper/torch, yt-dlp) and translator (transformers) take
+# seconds to import, so they are only loaded once a call actually needs them;
+# text-only runs never pay for it
+
+
+def transcribe(src: str):
+    """Lazy proxy for transcriber.transcribe."""
+    from .transcriber import transcribe as _transcribe
+
+    return _transcribe(src)
+
+
+def _normalise_source(src: str) -> Path:
+    """Lazy proxy for transcriber._normalise_source."""
+    from .transcriber import _normalise_source as _normalise
+
+    return _normalise(src)
+
+
+def translate(text: str, src_lang: str) -> str:
+    """Lazy proxy for translator.translate."""
+    from .translator import translate as _translate
+
+    return _translate(text, src_lang)
+
 # Supported file extensions
 _AUDIO_EXTS = (".wav", ".mp3", ".m4a", ".flac", ".ogg", ".mp4")
 _TEXT_EXTS = (".txt", ".csv")
@@ -378,43 +401,45 @@ def predict_any(
 
     # ─── 3. Classify ───────────────────────────────────────────────
     log.debug("Step 3: Classifying emotions for each segment.")
-    use_bert = False
+    texts = [seg["text"] for seg in segments]
+    translations = [
+        translate(txt, src_lang) if do_translate and src_lang != "en" else txt
+        for txt in texts
+    ]
+    results = [("nan", None)] * len(segments)
+
+    if do_classify:
+        if not do_classify_ext and not do_intensity:
+            results = predict_emotion_bert_batch(
+                translations, do_classify_ext, do_intensity
+            )
+        else:
+            # all segments go to LLaMA concurrently instead of one round-trip each
+            results = predict_emotion_llama_batch(
+                translations, do_classify_ext, do_intensity
+            )
+            # only the segments LLaMA failed on fall back to BERT
+            failed = [i for i, res in enumerate(results) if res is None]
+            if failed:
+                log.warning(
+                    "Llama failed for %d of %d segments; using BERT for those.",
+                    len(failed),
+                    len(results),
+                )
+                bert_results = predict_emotion_bert_batch(
+                    [translations[i] for i in failed], do_classify_ext, do_intensity
+                )
+                for i, res in zip(failed, bert_results):
+                    results[i] = res
+
     with csv_path.open("w", newline="", encoding="utf-8") as f:
         writer = _csv.writer(f)
         writer.writerow(headers)
 
-        for i, seg in enumerate(segments):
-            log.debug(f"Processing segment {i+1}/{len(segments)}...")
-            st, et, txt = _fmt(seg["start"]), _fmt(seg["end"]), seg["text"]
-            translation = (
-                translate(txt, src_lang) if do_translate and src_lang != "en" else txt
-            )
-            emo, score = "nan", None
-
-            if do_classify:
-                if not do_classify_ext and not do_intensity:
-                    emo, score = predict_emotion_bert(
-                        translation, do_classify_ext, do_intensity
-                    )
-                else:
-                    if not use_bert:
-                        try:
-                            emo, score = predict_emotion_llama(
-                                translation, do_classify_ext, do_intensity
-                            )
-                        except Exception as e:
-                            log.warning(
-                                "Llama failed (%s); switching to BERT for all subsequent segments.",
-                                e,
-                            )
-                            use_bert = True
-                            emo, score = predict_emotion_bert(
-                                translation, do_classify_ext, do_intensity
-                            )
-                    else:
-                        emo, score = predict_emotion_bert(
-                            translation, do_classify_ext, do_intensity
-                        )
+        for seg, txt, translation, (emo, score) in zip(
+            segments, texts, translations, results
+        ):
+            st, et = _fmt(seg["start"]), _fmt(seg["end"])
 
             label = ""
             if do_intensity and score is not None:
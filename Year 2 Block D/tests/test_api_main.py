@@ -76,3 +76,111 @@ def test_predict_internal_error(monkeypatch):
     data = response.json()
     # must exactly match your Pipeline error wording
     assert data["detail"] == "Pipeline error: Simulated failure"
+
+
+@pytest.mark.parametrize(
+    "header, expected",
+    [(None, "basic"), ("pro", "pro"), ("enterprise", 400), ("Pro", 400)],
+)
+def test_plan_dependency(header, expected):
+    """Test plan lookup from the x-plan header (unknown plans are a 400)."""
+    from fastapi import HTTPException
+
+    from emotion_mvp.api.main import plan_dependency
+
+    class _Req:
+        headers = {} if header is None else {"x-plan": header}
+
+    if expected == 400:
+        with pytest.raises(HTTPException) as exc_info:
+            plan_dependency(_Req())
+        assert exc_info.value.status_code == 400
+        assert exc_info.value.detail == f"Unknown plan {header!r}"
+    else:
+        assert plan_dependency(_Req()).value == expected
+
+
+def test_save_upload_streams_to_disk(tmp_path, monkeypatch):
+    """save_upload copies the upload chunk by chunk into the destination file."""
+    from fastapi import UploadFile
+
+    from emotion_mvp.api import main
+
+    monkeypatch.setattr(main, "CHUNK", 4)
+    payload = b"0123456789" * 3
+    upload = UploadFile(file=io.BytesIO(payload), filename="clip.wav")
+    dest = tmp_path / "clip.wav"
+
+    main.save_upload(upload, dest)
+
+    assert dest.read_bytes() == payload
+
+
+class _FakeContainer:
+    """Stand-in for the Azure container client that records every upload."""
+
+    def __init__(self):
+        self.uploads = {}
+
+    def upload_blob(self, name, data, **kwargs):
+        self.uploads[name] = data if isinstance(data, bytes) else data.read()
+
+
+def test_feedback_corrections_uploads_csv_and_meta(monkeypatch):
+    """Corrections are stored as a CSV plus the JSON payload."""
+    fake = _FakeContainer()
+    monkeypatch.setattr("emotion_mvp.api.main.CONTAINER_CLIENT", fake)
+
+    segment = {
+        "id": 1,
+        "start": "00:00:01",
+        "end": "00:00:03",
+        "sentence": "hoi",
+        "translation": "hi",
+        "emotion": "joy",
+    }
+    response = client.post(
+        "/api/predictions/pred.csv/feedback",
+        json={"correct": False, "corrections": [segment]},
+    )
+    assert response.status_code == 200
+
+    names = sorted(fake.uploads)
+    assert names[0].startswith("feedback/pred.csv/corrections-")
+    assert names[1].startswith("feedback/pred.csv/meta-")
+    csv_lines = fake.uploads[names[0]].decode().splitlines()
+    assert csv_lines[0] == "id,start,end,sentence,translation,emotion"
+    assert csv_lines[1] == "1,00:00:01,00:00:03,hoi,hi,joy"
+
+
+def test_feedback_correct_uploads_receipt(monkeypatch):
+    """A confirmed prediction stores a receipt JSON."""
+    fake = _FakeContainer()
+    monkeypatch.setattr("emotion_mvp.api.main.CONTAINER_CLIENT", fake)
+
+    response = client.post(
+        "/api/predictions/missing.csv/feedback", json={"correct": True}
+    )
+    assert response.status_code == 200
+    assert list(fake.uploads) and all("receipt-" in n for n in fake.uploads)
+
+
+def test_feedback_correct_archives_original(monkeypatch, tmp_path):
+    """A confirmed prediction also archives the original CSV if it is on disk."""
+    fake = _FakeContainer()
+    monkeypatch.setattr("emotion_mvp.api.main.CONTAINER_CLIENT", fake)
+    monkeypatch.setattr("emotion_mvp.api.main.LOCAL_DIR", tmp_path)
+    (tmp_path / "pred.csv").write_bytes(b"start,end\n")
+
+    response = client.post(
+        "/api/predictions/pred.csv/feedback", json={"correct": True}
+    )
+    assert response.status_code == 200
+    originals = [n for n in fake.uploads if "original-" in n]
+    assert len(originals) == 1 and fake.uploads[originals[0]] == b"start,end\n"
+
+
+def test_feedback_without_corrections_is_rejected():
+    """correct=False without corrections is a client error."""
+    response = client.post("/api/predictions/x/feedback", json={"correct": False})
+    assert response.status_code == 400
@@ -5,11 +5,22 @@ both BERT and LLaMA-based emotion classification models, including emotion
 extraction, intensity scoring, and error handling.
 """
 
+import threading
+import time
+
 import pytest
 from unittest.mock import patch, Mock
 import emotion_mvp.classifier as classifier
 
 
+@pytest.fixture(autouse=True)
+def _fresh_prediction_cache():
+    """Start every test with an empty prediction cache."""
+    classifier.clear_prediction_cache()
+    yield
+    classifier.clear_prediction_cache()
+
+
 # ─── _extract_emotion ────────────────────────────────────────────────
 @pytest.mark.parametrize(
     "text, expected",
@@ -94,6 +105,77 @@ def test_predict_emotion_llama_intensity(mock_call_llama):
     assert intensity == pytest.approx(0.75)
 
 
+# ─── predict_emotion_llama_batch ───────────────────────────────────
+@patch.object(classifier, "_call_llama")
+def test_predict_emotion_llama_batch_keeps_order(mock_call_llama):
+    """Test batched LLaMA prediction.
+
+    Args:
+        mock_call_llama: Mock for the LLaMA API call.
+
+    Tests:
+        - One result per input sentence, in input order
+        - Empty input returns an empty list without calling LLaMA
+    """
+    mock_call_llama.side_effect = lambda messages: (
+        "Answer: sad" if "Sentence: gloomy" in messages[-1]["content"] else "Answer: happy"
+    )
+    out = classifier.predict_emotion_llama_batch(
+        ["gloomy day", "great", "gloomy night"], classify_ext=False, do_intensity=False
+    )
+    assert out == [("sad", None), ("happy", None), ("sad", None)]
+    assert classifier.predict_emotion_llama_batch([], False, False) == []
+
+
+@patch.object(classifier, "_call_llama")
+def test_predict_emotion_llama_batch_marks_failures(mock_call_llama):
+    """Test batched LLaMA prediction when some calls fail.
+
+    Args:
+        mock_call_llama: Mock for the LLaMA API call, failing for one sentence.
+
+    Tests:
+        - A failed sentence gives None instead of raising
+        - The other sentences keep their LLaMA result
+    """
+
+    def fake_call(messages):
+        if "Sentence: broken" in messages[-1]["content"]:
+            raise RuntimeError("down")
+        return "Answer: happy"
+
+    mock_call_llama.side_effect = fake_call
+    out = classifier.predict_emotion_llama_batch(
+        ["fine one", "broken one", "fine two"], False, False
+    )
+    assert out == [("happy", None), None, ("happy", None)]
+
+
+# ─── prediction cache ──────────────────────────────────────────────
+@patch.object(classifier, "_call_llama", return_value="Answer: happy")
+def test_predict_emotion_llama_cached(mock_call_llama):
+    """Test that repeated sentences are served from the prediction cache.
+
+    Args:
+        mock_call_llama: Mock for the LLaMA API call.
+
+    Tests:
+        - Same sentence and tier (ignoring extra whitespace) hits the cache
+        - A different tier is a separate cache entry
+        - Duplicates within a batch are only sent once
+    """
+    assert classifier.predict_emotion_llama("okay", False, False) == ("happy", None)
+    assert classifier.predict_emotion_llama("  okay ", False, False) == ("happy", None)
+    assert mock_call_llama.call_count == 1
+
+    classifier.predict_emotion_llama("okay", True, False)
+    assert mock_call_llama.call_count == 2
+
+    out = classifier.predict_emotion_llama_batch(["yes", "yes", "yes"], False, False)
+    assert out == [("happy", None)] * 3
+    assert mock_call_llama.call_count == 3
+
+
 # ─── review_emotion_llama ──────────────────────────────────────────
 @patch.object(classifier, "_call_llama")
 def test_review_emotion_llama_basic(mock_call_llama):
@@ -183,7 +265,7 @@ def test_predict_emotion_bert_exception(mock_post):
 
 # ─── call llama fallback and success ───────────────────────────────
 @patch("emotion_mvp.classifier.LLAMA_FALLBACK_MODELS", new=["fallback_url"])
-@patch("emotion_mvp.classifier.requests.post")
+@patch.object(classifier._LLAMA_SESSION, "post")
 def test__call_llama_fallback_and_success(mock_post):
     """Test LLaMA API call with fallback mechanism.
 
@@ -204,3 +286,82 @@ def test__call_llama_fallback_and_success(mock_post):
     ]
     out = classifier._call_llama([{"role": "user", "content": "x"}])
     assert out == "Answer: happy"
+
+
+@patch.object(classifier, "LLAMA_HEDGE_DELAY", 0.01)
+@patch("emotion_mvp.classifier.LLAMA_FALLBACK_MODELS", new=["fallback"])
+@patch.object(classifier._LLAMA_SESSION, "post")
+def test__call_llama_hedges_slow_primary(mock_post):
+    """Test that a slow primary model is raced against the first fallback.
+
+    Args:
+        mock_post: Mock for HTTP POST requests.
+
+    Tests:
+        - The fallback is started once the hedge delay passes
+        - The first successful answer is returned
+    """
+    release = threading.Event()
+
+    def post(url, headers, json, timeout):
+        if json["model"] != "fallback":
+            release.wait(2)
+            content = "Answer: sad"
+        else:
+            content = "Answer: happy"
+        return Mock(
+            raise_for_status=lambda: None,
+            json=lambda: {"choices": [{"message": {"content": content}}]},
+        )
+
+    mock_post.side_effect = post
+    try:
+        assert classifier._call_llama([{"role": "user", "content": "x"}]) == "Answer: happy"
+    finally:
+        release.set()
+
+
+@patch.object(classifier, "LLAMA_HEDGE_DELAY", None)
+@patch("emotion_mvp.classifier.LLAMA_FALLBACK_MODELS", new=["fallback"])
+@patch.object(classifier._LLAMA_SESSION, "post")
+def test__call_llama_no_hedge_by_default(mock_post):
+    """Test that without a hedge delay a slow primary is simply awaited.
+
+    Args:
+        mock_post: Mock for HTTP POST requests.
+
+    Tests:
+        - The fallback model is not called while the primary succeeds
+    """
+
+    def post(url, headers, json, timeout):
+        time.sleep(0.05)
+        return Mock(
+            raise_for_status=lambda: None,
+            json=lambda: {"choices": [{"message": {"content": "Answer: sad"}}]},
+        )
+
+    mock_post.side_effect = post
+    assert classifier._call_llama([{"role": "user", "content": "x"}]) == "Answer: sad"
+    assert [c.kwargs["json"]["model"] for c in mock_post.call_args_list] == [
+        classifier.LLAMA_MODEL_ID
+    ]
+
+
+# ─── predict_emotion_bert_batch ────────────────────────────────────
+@patch.object(classifier, "predict_emotion_bert")
+def test_predict_emotion_bert_batch(mock_bert):
+    """Test batched BERT prediction.
+
+    Args:
+        mock_bert: Mock for the single-sentence BERT call.
+
+    Tests:
+        - One result per input sentence, in input order
+        - Duplicate sentences are only sent once
+    """
+    mock_bert.side_effect = lambda s, ext, it: ("sad" if s == "bad" else "happy", None)
+    out = classifier.predict_emotion_bert_batch(["bad", "good", "bad"], False, False)
+    assert out == [("sad", None), ("happy", None), ("sad", None)]
+    assert mock_bert.call_count == 2
+    assert classifier.predict_emotion_bert_batch([], False, False) == []
@@ -40,7 +40,7 @@ def test_main_flow(capsys, monkeypatch):
     # This reliably replaces the real data loader with our fake one for this test
     from emotion_mvp import data_loader
 
-    monkeypatch.setattr(data_loader, "load_and_clean_data", lambda path: dummy_df)
+    monkeypatch.setattr(data_loader, "load_and_clean_data", lambda path, **kwargs: dummy_df)
 
     # 3. Mock the inference functions to prevent real API calls
     from emotion_mvp import inference
@@ -112,7 +112,7 @@ def test_valid_emotions():
     """
     config = reload_config()
     assert "joy" in config.VALID_EMOTIONS
-    assert isinstance(config.VALID_EMOTIONS, set)
+    assert isinstance(config.VALID_EMOTIONS, frozenset)
 
 
 def test_history_filename():
@@ -124,6 +124,8 @@ def test_history_filename():
     """
     config = reload_config()
     assert config.HISTORY_FILE.endswith(".csv")
+    # resolved once per process
+    assert config.get_history_file() is config.get_history_file()
 
 
 def test_bert_api_defaults():
@@ -98,3 +98,24 @@ def test_load_and_clean_data_malformed(tmp_path):
     bad.write_text("just,some,random,values\n1,2,3,4")
     with pytest.raises(KeyError):
         load_and_clean_data(str(bad))
+
+
+def test_load_and_clean_data_usecols(tmp_path):
+    """Test loading only a subset of the CSV columns.
+
+    Args:
+        tmp_path: Pytest temporary directory fixture.
+
+    Tests:
+        - Only the requested columns are returned
+        - Cleaning still applies to the 'Emotion' column
+    """
+    content = (
+        "Sentence,Translation,Emotion,Source\n"
+        "hallo,hello,joy,a\n"
+        "doei,bye,,b\n"
+    )
+    csv_path = make_csv(tmp_path, content)
+    df = load_and_clean_data(str(csv_path), usecols=["Translation", "Emotion"])
+    assert list(df.columns) == ["Translation", "Emotion"]
+    assert list(df["Translation"]) == ["hello"]
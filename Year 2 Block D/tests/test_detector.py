@@ -6,6 +6,7 @@ language detection from text input and error handling scenarios.
 """
 
 from unittest.mock import patch
+from emotion_mvp import detector
 from emotion_mvp.detector import detect_lang
 
 
@@ -49,3 +50,45 @@ def test_detect_lang_exception(mock_detect, caplog):
         "defaulting to 'en'" in rec.getMessage() and rec.levelname == "WARNING"
         for rec in caplog.records
     )
+
+
+@patch("emotion_mvp.detector.detect", return_value="nl")
+def test_detect_lang_cached(mock_detect):
+    """Test that short texts are only scored once.
+
+    Args:
+        mock_detect: Mock for the langdetect.detect function.
+
+    Tests:
+        - Repeated short texts are served from the cache
+        - Long texts bypass the cache
+    """
+    detector._cached_detect.cache_clear()
+    assert detect_lang("goedemorgen") == "nl"
+    assert detect_lang("goedemorgen") == "nl"
+    assert mock_detect.call_count == 1
+
+    long_text = "woord " * detector.CACHE_MAX_CHARS
+    detect_lang(long_text)
+    detect_lang(long_text)
+    assert mock_detect.call_count == 3
+    detector._cached_detect.cache_clear()
+
+
+def test_detect_lang_fasttext_backend(monkeypatch):
+    """Test the optional fastText backend.
+
+    Tests:
+        - The '__label__' prefix is stripped from the prediction
+        - Newlines are flattened before predicting
+    """
+
+    class _FakeModel:
+        def predict(self, text, k):
+            assert "\n" not in text and k == 1
+            return ("__label__de",), (0.99,)
+
+    monkeypatch.setattr(detector, "_FASTTEXT", _FakeModel())
+    detector._cached_detect.cache_clear()
+    assert detect_lang("Guten Morgen\nallerseits") == "de"
+    detector._cached_detect.cache_clear()
@@ -27,10 +27,11 @@ def use_tmp_history(tmp_path, monkeypatch):
     Returns:
         Path: Path to the temporary history file.
     """
-    # Redirect HISTORY_FILE to a temp file
+    # Redirect the history file to a temp file
     temp_file = tmp_path / "history.csv"
-    monkeypatch.setattr(history, "HISTORY_FILE", str(temp_file))
-    return temp_file
+    monkeypatch.setattr(history, "get_history_file", lambda: str(temp_file))
+    yield temp_file
+    history._close_history()
 
 
 def test_log_inference_creates_file_with_header(use_tmp_history):
@@ -120,3 +121,23 @@ def test_missing_keys_written_as_empty(use_tmp_history):
         assert row["language"] == ""
         assert row["translated"] == ""
         assert row["csv"] == ""
+
+
+def test_log_inference_reuses_open_file(use_tmp_history, tmp_path, monkeypatch):
+    """Test that the history file is kept open between records.
+
+    Tests:
+        - Consecutive records go through the same file handle
+        - Pointing the history file elsewhere opens the new file with a header
+    """
+    history.log_inference("first", {})
+    handle = history._FP
+    history.log_inference("second", {})
+    assert history._FP is handle
+
+    other = tmp_path / "other.csv"
+    monkeypatch.setattr(history, "get_history_file", lambda: str(other))
+    history.log_inference("third", {})
+    assert history._FP is not handle and handle.closed
+    assert other.read_text(encoding="utf-8").startswith("timestamp,input")
+    assert len(use_tmp_history.read_text(encoding="utf-8").splitlines()) == 3
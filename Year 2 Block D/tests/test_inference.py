@@ -32,9 +32,9 @@ def test_get_emotion_success(mocker):
         "choices": [{"message": {"content": "Some text before... Answer: joy"}}]
     }
 
-    # 2. Use 'mocker' to replace the real 'requests.post' with our fake response.
-    # Now, whenever inference.py calls requests.post, it will get our mock_response.
-    mocker.patch("requests.post", return_value=mock_response)
+    # 2. Use 'mocker' to replace the session's 'post' with our fake response.
+    # Now, whenever inference.py posts through its session, it will get our mock_response.
+    mocker.patch("emotion_mvp.inference._SESSION.post", return_value=mock_response)
 
     # 3. Call the function you want to test.
     emotion, prompt = inference.get_emotion("This is a test sentence.")
@@ -55,9 +55,9 @@ def test_get_emotion_api_error(mocker):
         - Fallback to 'nan' emotion on API failures
         - Error resilience and proper exception handling
     """
-    # 1. Patch 'requests.post' to raise a network connection error instead of returning a value.
+    # 1. Patch the session's 'post' to raise a network connection error instead of returning a value.
     mocker.patch(
-        "requests.post",
+        "emotion_mvp.inference._SESSION.post",
         side_effect=requests.exceptions.RequestException("Network Error"),
     )
 
@@ -92,10 +92,30 @@ def test_get_emotion_invalid_emotion_in_response(mocker):
             }
         ]
     }
-    mocker.patch("requests.post", return_value=mock_response)
+    mocker.patch("emotion_mvp.inference._SESSION.post", return_value=mock_response)
 
     # 2. Call the function.
     emotion, prompt = inference.get_emotion("This is another test.")
 
     # 3. Assert that your function correctly identifies the emotion as invalid and returns 'nan'.
     assert emotion == "nan"
+
+
+def test_get_emotions_batch_keeps_order(mocker):
+    """Test concurrent classification of several sentences.
+
+    Args:
+        mocker: Pytest-mock fixture for mocking dependencies.
+
+    Tests:
+        - One result per sentence, in input order
+        - Empty input returns an empty list
+    """
+    mocker.patch.object(
+        inference,
+        "get_emotion",
+        side_effect=lambda s, temperature: ("sadness" if "sad" in s else "joy", s),
+    )
+    out = inference.get_emotions_batch(["so sad", "great", "sad again"])
+    assert [emo for emo, _ in out] == ["sadness", "joy", "sadness"]
+    assert inference.get_emotions_batch([]) == []
@@ -9,6 +9,7 @@ import csv
 import pytest
 from pathlib import Path
 
+import emotion_mvp.classifier as classifier
 import emotion_mvp.pipeline as pipeline
 
 
@@ -159,10 +160,14 @@ def test_predict_any_csv_input(monkeypatch, tmp_path):
     monkeypatch.setattr(pipeline, "detect_lang", lambda t: "en")
     monkeypatch.setattr(pipeline, "translate", lambda t, lang: t)
     monkeypatch.setattr(
-        pipeline, "predict_emotion_bert", lambda t, ext, it: ("joy", None)
+        pipeline,
+        "predict_emotion_bert_batch",
+        lambda ts, ext, it: [("joy", None)] * len(ts),
     )
     monkeypatch.setattr(
-        pipeline, "predict_emotion_llama", lambda t, ext, it: ("joy", None)
+        pipeline,
+        "predict_emotion_llama_batch",
+        lambda ts, ext, it: [("joy", None)] * len(ts),
     )
 
     summary = pipeline.predict_any(
@@ -277,10 +282,14 @@ def test_predict_any_empty_csv_fallback(tmp_path, monkeypatch):
     monkeypatch.setattr(pipeline, "detect_lang", lambda t: "en")
     monkeypatch.setattr(pipeline, "translate", lambda t, lang: t)
     monkeypatch.setattr(
-        pipeline, "predict_emotion_bert", lambda t, ext, it: ("joy", None)
+        pipeline,
+        "predict_emotion_bert_batch",
+        lambda ts, ext, it: [("joy", None)] * len(ts),
     )
     monkeypatch.setattr(
-        pipeline, "predict_emotion_llama", lambda t, ext, it: ("joy", None)
+        pipeline,
+        "predict_emotion_llama_batch",
+        lambda ts, ext, it: [("joy", None)] * len(ts),
     )
 
     calls = []
@@ -357,12 +366,14 @@ def test_predict_any_llama_fallback_to_bert(monkeypatch, tmp_path):
     monkeypatch.setenv("TRANSCRIPT_DIR", str(tmp_path))
     monkeypatch.setattr(pipeline, "detect_lang", lambda t: "en")
 
-    def llama_fail(text, ext, it):
-        raise RuntimeError("nope")
+    def llama_fail(texts, ext, it):
+        return [None] * len(texts)
 
-    monkeypatch.setattr(pipeline, "predict_emotion_llama", llama_fail)
+    monkeypatch.setattr(pipeline, "predict_emotion_llama_batch", llama_fail)
     monkeypatch.setattr(
-        pipeline, "predict_emotion_bert", lambda t, ext, it: ("sad", None)
+        pipeline,
+        "predict_emotion_bert_batch",
+        lambda ts, ext, it: [("sad", None)] * len(ts),
     )
 
     summary = pipeline.predict_any(
@@ -377,3 +388,48 @@ def test_predict_any_llama_fallback_to_bert(monkeypatch, tmp_path):
     out_csv = tmp_path / Path(summary["csv"]).name
     rows = list(csv.reader(out_csv.open()))
     assert rows[1][4] == "sad"
+
+
+def test_predict_any_llama_partial_fallback(monkeypatch, tmp_path):
+    """Test that only the segments LLaMA failed on fall back to BERT.
+
+    Args:
+        monkeypatch: Pytest fixture for mocking dependencies.
+        tmp_path: Pytest temporary directory fixture.
+
+    Tests:
+        - Segments LLaMA answered keep the LLaMA emotion
+        - Only the failed (later) segment is sent to BERT
+    """
+    inp = tmp_path / "input.csv"
+    inp.write_text("Text\nFirst works\nSecond breaks")
+    monkeypatch.setenv("TRANSCRIPT_DIR", str(tmp_path))
+    monkeypatch.setattr(pipeline, "detect_lang", lambda t: "en")
+
+    def fake_call(messages):
+        if "Sentence: Second breaks" in messages[-1]["content"]:
+            raise RuntimeError("nope")
+        return "Answer: joy"
+
+    monkeypatch.setattr(classifier, "_call_llama", fake_call)
+    bert_inputs = []
+
+    def fake_bert(ts, ext, it):
+        bert_inputs.extend(ts)
+        return [("sadness", None)] * len(ts)
+
+    monkeypatch.setattr(pipeline, "predict_emotion_bert_batch", fake_bert)
+
+    summary = pipeline.predict_any(
+        inp=str(inp),
+        model="base",
+        do_translate=False,
+        do_classify=True,
+        do_classify_ext=True,
+        do_intensity=False,
+        persist=False,
+    )
+    out_csv = tmp_path / Path(summary["csv"]).name
+    rows = list(csv.reader(out_csv.open()))
+    assert [row[4] for row in rows[1:]] == ["joy", "sadness"]
+    assert bert_inputs == ["Second breaks."]